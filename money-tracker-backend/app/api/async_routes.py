@@ -0,0 +1,186 @@
+"""
+Async handlers for the hottest endpoints, used when settings.ASYNC_DB is enabled.
+
+This router is included ahead of the sync routers, so these paths are served on the
+event loop while the remaining endpoints keep their sync handlers. Paths that would
+shadow static sync routes (e.g. GET /transactions/{id} vs /transactions/export) are
+deliberately left out.
+"""
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+from datetime import date
+
+from app.core.database import get_async_db
+from app.core.security import get_current_user_async
+from app.core.pagination import next_cursor
+from app.core.response_cache import response_cache
+from app.core.serialization import rows_to_dicts
+from app.schemas.transaction import (
+    TransactionCreate, TransactionUpdate, TransactionResponse, DashboardData, TimeSeriesData
+)
+from app.schemas.wallet import WalletResponse, WalletSummary, WalletAnalytics, WalletHistory
+from app.services.async_services import AsyncTransactionService, AsyncWalletService
+
+router = APIRouter()
+
+@router.post("/transactions", response_model=TransactionResponse)
+async def create_transaction(
+    transaction: TransactionCreate,
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Create a new transaction."""
+    return await AsyncTransactionService.create_transaction(db, transaction, current_user)
+
+@router.get("/transactions", response_model=List[TransactionResponse])
+async def get_transactions(
+    skip: int = 0,
+    limit: int = 100,
+    category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get user's transactions, newest first."""
+    transactions = await AsyncTransactionService.get_transactions(
+        db, current_user, skip, limit, category, cursor, as_rows=True
+    )
+    response = ORJSONResponse(rows_to_dicts(transactions))
+    cursor_value = next_cursor(transactions, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return response
+
+@router.put("/transactions/{transaction_id}", response_model=TransactionResponse)
+async def update_transaction(
+    transaction_id: int,
+    transaction_update: TransactionUpdate,
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Update a transaction."""
+    return await AsyncTransactionService.update_transaction(db, transaction_id, transaction_update, current_user)
+
+@router.delete("/transactions/{transaction_id}")
+async def delete_transaction(
+    transaction_id: int,
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Delete a transaction."""
+    return await AsyncTransactionService.delete_transaction(db, transaction_id, current_user)
+
+@router.get("/dashboard", response_model=DashboardData)
+async def get_dashboard_data(
+    request: Request,
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get dashboard data."""
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached, await AsyncTransactionService.get_dashboard_data(db, current_user), DashboardData
+    )
+
+@router.get("/analytics/category-spending")
+async def get_category_spending(
+    request: Request,
+    start: Optional[date] = Query(None, description="First day (default: all history)"),
+    end: Optional[date] = Query(None, description="Last day (default: all history)"),
+    wallet_id: Optional[int] = None,
+    top: Optional[int] = Query(None, ge=1, le=50, description="Keep the largest N categories, fold the rest into Other"),
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get category spending analysis."""
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached, await AsyncTransactionService.get_category_spending(db, current_user, start, end, wallet_id, top)
+    )
+
+@router.get("/analytics/timeseries", response_model=TimeSeriesData)
+async def get_time_series(
+    request: Request,
+    interval: str = Query("month", pattern="^(day|week|month)$", description="Bucket size"),
+    start: Optional[date] = Query(None, description="First day (default: 30 days, 12 weeks or 12 months before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    wallet_id: Optional[int] = None,
+    category: Optional[str] = None,
+    group_by: Optional[str] = Query(None, pattern="^(wallet|category)$", description="One series per wallet or category"),
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get income, expenses and net per day, week or month."""
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached,
+        await AsyncTransactionService.get_time_series(
+            db, current_user, interval, start, end, wallet_id, category, group_by
+        ),
+        TimeSeriesData
+    )
+
+@router.get("/wallets", response_model=List[WalletResponse])
+async def get_wallets(
+    request: Request,
+    include_inactive: bool = Query(False, description="Include inactive wallets"),
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get all user's wallets."""
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached, await AsyncWalletService.get_wallets(db, current_user, include_inactive), List[WalletResponse]
+    )
+
+@router.get("/wallets/summary", response_model=List[WalletSummary])
+async def get_wallets_summary(
+    request: Request,
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get wallets summary with transaction counts."""
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached, await AsyncWalletService.get_wallets_summary(db, current_user), List[WalletSummary]
+    )
+
+@router.get("/wallets/{wallet_id}/analytics", response_model=WalletAnalytics)
+async def get_wallet_analytics(
+    wallet_id: int,
+    days: int = Query(30, ge=1, le=365, description="Number of days for analytics"),
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get analytics for a specific wallet."""
+    return await AsyncWalletService.get_wallet_analytics(db, wallet_id, current_user, days)
+
+@router.get("/wallets/{wallet_id}/history", response_model=WalletHistory)
+async def get_wallet_history(
+    wallet_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include total_count (costs an extra query)"),
+    current_user = Depends(get_current_user_async),
+    db = Depends(get_async_db)
+):
+    """Get transaction history for a specific wallet."""
+    history = await AsyncWalletService.get_wallet_history(
+        db, wallet_id, current_user, skip, limit, cursor, include_total, as_rows=True
+    )
+    history["wallet"] = WalletResponse.model_validate(history["wallet"]).model_dump()
+    history["transactions"] = rows_to_dicts(history["transactions"])
+    return ORJSONResponse(history)
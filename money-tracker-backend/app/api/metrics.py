@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import user_cache
+from app.core.response_cache import response_cache
+from app.core.database import engine, async_engine
+from app.core.metrics import metrics_registry
+from app.core.pool import pool_stats
+from app.core.security import password_pool
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """Get request, pool, cache and password hashing metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/metrics/cache")
+def get_cache_metrics():
+    """Get user and response cache hit/miss counters for this worker."""
+    return {"user_cache": user_cache.stats(), "response_cache": response_cache.stats()}
+
+@router.get("/metrics/pool")
+def get_pool_metrics():
+    """Get database connection pool usage and checkout wait times for this worker."""
+    metrics = {"sync": pool_stats(engine.pool)}
+    if async_engine is not None:
+        metrics["async"] = pool_stats(async_engine.pool)
+    return metrics
+
+@router.get("/metrics/password-pool")
+def get_password_pool_metrics():
+    """Get password hashing queue depth and rejections for this worker."""
+    return {
+        "queue_depth": password_pool.queue_depth(),
+        "capacity": password_pool.capacity,
+        "rejected": password_pool.rejected
+    }
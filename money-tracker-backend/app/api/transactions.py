@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date, datetime
 
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse, DashboardData
+from app.core.pagination import next_cursor
+from app.core.response_cache import response_cache
+from app.core.serialization import rows_to_dicts
+from app.schemas.transaction import (
+    TransactionCreate, TransactionUpdate, TransactionResponse, DashboardData,
+    TransactionImportResult, TimeSeriesData
+)
 from app.services.transaction_service import TransactionService
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.services.wallet_service import WalletService
 
 router = APIRouter()
 
@@ -18,16 +29,65 @@ def create_transaction(
     """Create a new transaction."""
     return TransactionService.create_transaction(db, transaction, current_user)
 
+@router.post("/transactions/bulk", response_model=TransactionImportResult)
+def import_transactions(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ofx; inferred from the file name if omitted"),
+    wallet_id: Optional[int] = Query(None, description="Wallet for rows that do not name one"),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Bulk import transactions from a CSV or OFX bank statement.
+    
+    Invalid rows are reported in the response and do not abort the import.
+    """
+    file_format = (format or (file.filename or "").rsplit(".", 1)[-1]).lower()
+    if file_format == "qfx":
+        file_format = "ofx"
+    return ImportService.import_transactions(db, file.file, file_format, current_user, wallet_id)
+
 @router.get("/transactions", response_model=List[TransactionResponse])
 def get_transactions(
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get user's transactions."""
-    return TransactionService.get_transactions(db, current_user, skip, limit, category)
+    """Get user's transactions, newest first.
+    
+    The cursor for the following page is returned in the X-Next-Cursor header.
+    """
+    transactions = TransactionService.get_transactions(
+        db, current_user, skip, limit, category, cursor, as_rows=True
+    )
+    response = ORJSONResponse(rows_to_dicts(transactions))
+    cursor_value = next_cursor(transactions, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return response
+
+@router.get("/transactions/export")
+def export_transactions(
+    format: str = Query("csv", description="csv, ndjson or parquet"),
+    start: Optional[datetime] = Query(None, description="Only transactions on or after this date"),
+    end: Optional[datetime] = Query(None, description="Only transactions before this date"),
+    wallet_id: Optional[int] = Query(None),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream the user's full transaction history as a file download."""
+    file_format = format.lower()
+    ExportService.check_format(file_format)
+    if wallet_id is not None:
+        WalletService.get_wallet(db, wallet_id, current_user)
+    
+    return StreamingResponse(
+        ExportService.stream(file_format, current_user.id, start, end, wallet_id),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{file_format}"'}
+    )
 
 @router.get("/transactions/{transaction_id}", response_model=TransactionResponse)
 def get_transaction(
@@ -59,11 +119,15 @@ def delete_transaction(
 
 @router.get("/dashboard", response_model=DashboardData)
 def get_dashboard_data(
+    request: Request,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get dashboard data."""
-    return TransactionService.get_dashboard_data(db, current_user)
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(cached, TransactionService.get_dashboard_data(db, current_user), DashboardData)
 
 @router.get("/categories")
 def get_categories():
@@ -74,8 +138,40 @@ def get_categories():
 
 @router.get("/analytics/category-spending")
 def get_category_spending(
+    request: Request,
+    start: Optional[date] = Query(None, description="First day (default: all history)"),
+    end: Optional[date] = Query(None, description="Last day (default: all history)"),
+    wallet_id: Optional[int] = None,
+    top: Optional[int] = Query(None, ge=1, le=50, description="Keep the largest N categories, fold the rest into Other"),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get category spending analysis."""
-    return TransactionService.get_category_spending(db, current_user)
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached, TransactionService.get_category_spending(db, current_user, start, end, wallet_id, top)
+    )
+
+@router.get("/analytics/timeseries", response_model=TimeSeriesData)
+def get_time_series(
+    request: Request,
+    interval: str = Query("month", pattern="^(day|week|month)$", description="Bucket size"),
+    start: Optional[date] = Query(None, description="First day (default: 30 days, 12 weeks or 12 months before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    wallet_id: Optional[int] = None,
+    category: Optional[str] = None,
+    group_by: Optional[str] = Query(None, pattern="^(wallet|category)$", description="One series per wallet or category"),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get income, expenses and net per day, week or month."""
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached,
+        TransactionService.get_time_series(db, current_user, interval, start, end, wallet_id, category, group_by),
+        TimeSeriesData
+    )
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.security import get_current_user
+from app.core.response_cache import response_cache
+from app.core.serialization import rows_to_dicts, nest
 from app.schemas.wallet import (
     WalletCreate, WalletUpdate, WalletResponse, WalletSummary,
     WalletTransferCreate, WalletTransferResponse,
@@ -25,37 +28,30 @@ def create_wallet(
 
 @router.get("/wallets", response_model=List[WalletResponse])
 def get_wallets(
+    request: Request,
     include_inactive: bool = Query(False, description="Include inactive wallets"),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all user's wallets."""
-    return WalletService.get_wallets(db, current_user, include_inactive)
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(
+        cached, WalletService.get_wallets(db, current_user, include_inactive), List[WalletResponse]
+    )
 
 @router.get("/wallets/summary", response_model=List[WalletSummary])
 def get_wallets_summary(
+    request: Request,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get wallets summary with transaction counts."""
-    wallets = WalletService.get_wallets(db, current_user)
-    summary_list = []
-    
-    for wallet in wallets:
-        transaction_count = len(wallet.transactions)
-        summary_list.append(WalletSummary(
-            id=wallet.id,
-            name=wallet.name,
-            wallet_type=wallet.wallet_type,
-            icon=wallet.icon,
-            color=wallet.color,
-            balance=wallet.balance,
-            is_default=wallet.is_default,
-            is_active=wallet.is_active,
-            transaction_count=transaction_count
-        ))
-    
-    return summary_list
+    cached = response_cache.lookup(request, current_user.id)
+    if cached.response:
+        return cached.response
+    return response_cache.store(cached, WalletService.get_wallets_summary(db, current_user), List[WalletSummary])
 
 @router.get("/wallets/default", response_model=Optional[WalletResponse])
 def get_default_wallet(
@@ -65,6 +61,20 @@ def get_default_wallet(
     """Get user's default wallet."""
     return WalletService.get_default_wallet(db, current_user)
 
+@router.get("/wallets/transfers", response_model=List[WalletTransferResponse])
+def get_wallet_transfers(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get wallet transfer history."""
+    transfers = rows_to_dicts(WalletService.get_transfers(db, current_user, skip, limit, as_rows=True))
+    for transfer in transfers:
+        transfer["from_wallet"] = nest(transfer, "from_wallet__")
+        transfer["to_wallet"] = nest(transfer, "to_wallet__")
+    return ORJSONResponse(transfers)
+
 @router.get("/wallets/{wallet_id}", response_model=WalletResponse)
 def get_wallet(
     wallet_id: int,
@@ -103,23 +113,6 @@ def transfer_money(
     """Transfer money between wallets."""
     return WalletService.transfer_money(db, transfer, current_user)
 
-@router.get("/wallets/transfers", response_model=List[WalletTransferResponse])
-def get_wallet_transfers(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get wallet transfer history."""
-    from app.models.wallet import WalletTransfer
-    from sqlalchemy import and_
-    
-    transfers = db.query(WalletTransfer).filter(
-        WalletTransfer.user_id == current_user.id
-    ).order_by(WalletTransfer.transfer_date.desc()).offset(skip).limit(limit).all()
-    
-    return transfers
-
 @router.post("/wallets/{wallet_id}/adjust", response_model=BalanceAdjustmentResponse)
 def adjust_wallet_balance(
     wallet_id: int,
@@ -147,11 +140,18 @@ def get_wallet_history(
     wallet_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include total_count (costs an extra query)"),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get transaction history for a specific wallet."""
-    return WalletService.get_wallet_history(db, wallet_id, current_user, skip, limit)
+    history = WalletService.get_wallet_history(
+        db, wallet_id, current_user, skip, limit, cursor, include_total, as_rows=True
+    )
+    history["wallet"] = WalletResponse.model_validate(history["wallet"]).model_dump()
+    history["transactions"] = rows_to_dicts(history["transactions"])
+    return ORJSONResponse(history)
 
 @router.get("/wallets/{wallet_id}/adjustments", response_model=List[BalanceAdjustmentResponse])
 def get_balance_adjustments(
@@ -162,14 +162,4 @@ def get_balance_adjustments(
     db: Session = Depends(get_db)
 ):
     """Get balance adjustment history for a wallet."""
-    from app.models.wallet import BalanceAdjustment
-    from sqlalchemy import and_
-    
-    # Verify wallet ownership
-    WalletService.get_wallet(db, wallet_id, current_user)
-    
-    adjustments = db.query(BalanceAdjustment).filter(
-        and_(BalanceAdjustment.wallet_id == wallet_id, BalanceAdjustment.user_id == current_user.id)
-    ).order_by(BalanceAdjustment.adjusted_at.desc()).offset(skip).limit(limit).all()
-    
-    return adjustments
+    return WalletService.get_balance_adjustments(db, wallet_id, current_user, skip, limit)
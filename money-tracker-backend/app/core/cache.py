@@ -0,0 +1,200 @@
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import User
+
+class CacheBackend(ABC):
+    """Interface for key/value cache backends."""
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under key, or None if it is missing or expired."""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: int):
+        """Store a JSON-serializable value under key for ttl seconds."""
+    
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove key if present."""
+
+class InProcessBackend(CacheBackend):
+    """Thread-safe LRU cache with per-entry TTL, local to one worker process."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class RedisBackend(CacheBackend):
+    """Cache backend on a redis-py compatible client, with JSON-encoded values."""
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+    
+    def set(self, key: str, value: Any, ttl: int):
+        self.client.setex(key, ttl, json.dumps(value))
+    
+    def delete(self, key: str):
+        self.client.delete(key)
+
+class SQLiteBackend(CacheBackend):
+    """Cache backend in a SQLite file, shared by the worker processes of one host.
+    
+    Each thread keeps its own connection. WAL lets readers run during a write, and writes
+    skip fsync: losing entries only causes cache misses. Values are JSON-encoded and
+    expire on wall-clock time, which all processes agree on.
+    """
+    
+    # Fraction of writes that also purge expired entries
+    PURGE_PROBABILITY = 0.01
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connection()
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+    
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Any, ttl: int):
+        now = time.time()
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, json.dumps(value), now + ttl))
+        if random.random() < self.PURGE_PROBABILITY:
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+    
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+def create_backend(name: str) -> CacheBackend:
+    """Build the cache backend selected in settings ("memory", "sqlite" or "redis")."""
+    if name == "sqlite":
+        return SQLiteBackend(settings.SHARED_CACHE_PATH or os.path.join(tempfile.gettempdir(), "money-tracker-cache.db"))
+    if name == "redis":
+        # A per-process stand-in would look shared without being shared
+        if not settings.REDIS_URL:
+            raise RuntimeError("The redis cache backend requires REDIS_URL")
+        import redis
+        return RedisBackend(redis.Redis.from_url(settings.REDIS_URL))
+    if name == "memory":
+        return InProcessBackend(settings.USER_CACHE_MAX_SIZE)
+    # A typo would otherwise quietly give each worker its own cache
+    raise ValueError(f"Unknown cache backend {name!r}, use one of: memory, sqlite, redis")
+
+class UserCache:
+    """Cache of authenticated users keyed by the token's uid claim, with hit/miss counters."""
+    
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{user_id}"
+    
+    def get(self, user_id: int, username: str) -> Optional[User]:
+        """Return a detached User for the token claims, or None on a miss."""
+        data = self.backend.get(self._key(user_id))
+        # A username mismatch means the token predates a rename; treat it as a miss
+        hit = data is not None and data["username"] == username
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            return None
+        return User(
+            id=data["id"],
+            username=data["username"],
+            email=data["email"],
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
+        )
+    
+    def set(self, user: User):
+        """Cache the fields of a user loaded from the database."""
+        self.backend.set(self._key(user.id), {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "created_at": user.created_at.isoformat() if user.created_at else None
+        }, self.ttl)
+    
+    def invalidate(self, user_id: int):
+        """Drop a cached user, e.g. after it was updated or deleted."""
+        self.backend.delete(self._key(user_id))
+    
+    def stats(self) -> dict:
+        """Return hit/miss counters for this process."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+user_cache = UserCache(create_backend(settings.USER_CACHE_BACKEND), settings.USER_CACHE_TTL_SECONDS)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    """Keep the cache in step with changes made through the ORM."""
+    user_cache.invalidate(target.id)
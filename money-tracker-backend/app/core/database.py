@@ -1,20 +1,103 @@
-from sqlalchemy import create_engine
+import asyncio
+import contextlib
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.dialect import configure_engine, is_memory_sqlite, is_sqlite, sqlite_engine_options
+from app.core.pool import InstrumentedQueuePool
+from app.core.query_stats import instrument_engine
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Build pool and connection options for create_engine from settings."""
+    if is_sqlite(url) and (is_async or is_memory_sqlite(url)):
+        return sqlite_engine_options(url, is_async)
+    
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if not is_async:
+        options["poolclass"] = InstrumentedQueuePool
+    
+    if not url.startswith("postgresql"):
+        return options
+    
+    connect_args = {}
+    if is_async and settings.DB_PGBOUNCER_MODE:
+        # asyncpg prepares statements server-side; that state does not survive
+        # PgBouncer handing the next transaction to another server connection
+        connect_args.update({"statement_cache_size": 0, "prepared_statement_cache_size": 0})
+    if settings.DB_STATEMENT_TIMEOUT_MS and not settings.DB_PGBOUNCER_MODE:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+def _set_local_statement_timeout(conn):
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+configure_engine(engine)
+instrument_engine(engine)
+if settings.DB_PGBOUNCER_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+    event.listen(engine, "begin", _set_local_statement_timeout)
 
-engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db() -> Session:
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto the matching async driver."""
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("sqlite"):
+        return "sqlite+aiosqlite://" + rest
+    return "postgresql+asyncpg://" + rest
+
+# The async engine is only built when enabled, so asyncpg/aiosqlite stay optional
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    
+    async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, is_async=True))
+    configure_engine(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine)
+    if settings.DB_PGBOUNCER_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+        event.listen(async_engine.sync_engine, "begin", _set_local_statement_timeout)
+    # Objects are serialized after the session call returns, so keep them loaded on commit
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# A sync request keeps its connection until its response is validated and its session
+# closed, and both steps need a threadpool slot. Without a cap, more requests than the
+# pool can serve fill every slot waiting on checkout and nothing is ever released.
+# An in-memory SQLite database has a single connection, shared by one session at a time.
+if isinstance(engine.pool, StaticPool):
+    _session_slots = asyncio.Semaphore(1)
+elif isinstance(engine.pool, QueuePool) and settings.DB_MAX_OVERFLOW >= 0:
+    # The pool was built from these settings (engine_options); a negative overflow is unbounded
+    _session_slots = asyncio.Semaphore(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+else:
+    _session_slots = None
+
+async def get_db() -> Session:
     """Database dependency for FastAPI."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    async with _session_slots or contextlib.nullcontext():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
 
-def create_tables():
-    """Create all database tables."""
-    Base.metadata.create_all(bind=engine)
+async def get_async_db():
+    """Async database dependency for FastAPI."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,80 @@
+"""
+Differences between the supported databases.
+
+PostgreSQL is the production database. SQLite, as a file (`sqlite:///./money_tracker.db`)
+or in memory (`sqlite://`), runs the app, the scripts and the benchmarks without a
+database server. SQLAlchemy covers most of the differences; the rest lives here:
+connection pragmas, pooling for in-memory databases, row locking and upserts.
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+
+# Memory-mapped reads; pages are still cached by the OS, so this only saves copies
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def is_memory_sqlite(url: str) -> bool:
+    """True for `sqlite://` and `sqlite:///:memory:` style URLs."""
+    if not is_sqlite(url):
+        return False
+    path = url.split("://", 1)[1].split("?", 1)[0].lstrip("/")
+    return path in ("", ":memory:") or "mode=memory" in url
+
+def sqlite_engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool options for in-memory or aiosqlite engines, which skip the regular pool."""
+    if not is_memory_sqlite(url):
+        # aiosqlite keeps the dialect's own pool
+        return {}
+    # An in-memory database lives and dies with its connection, so every session and
+    # thread has to share a single one
+    options = {"poolclass": StaticPool}
+    if not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the single writer (in-memory databases ignore it)
+    cursor.execute("PRAGMA journal_mode = WAL")
+    # NORMAL is durable with WAL except for the last commits before a power loss
+    cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    # Enforce foreign keys like PostgreSQL does
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.close()
+
+def configure_engine(engine):
+    """Apply the connection pragmas to every new connection of a SQLite engine."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+def lock_for_update(db, query):
+    """
+    Lock the rows a query selects until the transaction ends.
+    
+    SQLite has no row locks and drops FOR UPDATE, so there the database write lock is
+    taken first, with an UPDATE that matches no rows; concurrent read-modify-write
+    transactions then queue on busy_timeout instead of overwriting each other.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return query.with_for_update()
+    table = query.column_descriptions[0]["entity"].__table__
+    # A plain column, so that no foreign key checks are compiled into the statement
+    column = next(c.name for c in table.columns if not c.primary_key and not c.foreign_keys)
+    db.execute(text(f"UPDATE {table.name} SET {column} = {column} WHERE 0"))
+    return query
+
+def dialect_insert(db, model):
+    """INSERT for the session's database, with on_conflict_do_update (ON CONFLICT)."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,269 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+MetricsMiddleware records a latency histogram and a request counter per method and route
+template, plus the number of requests in flight. Pool, cache and password hashing stats
+are read from their owners when a snapshot is taken.
+
+With several uvicorn workers each process only sees its own requests, so when
+METRICS_MULTIPROC_DIR is set every worker writes its snapshot there every
+METRICS_FLUSH_SECONDS, and a scrape merges all files: counters and histograms are summed
+(including those of workers that have exited, so totals never go backwards) and gauges
+are reported per live worker with a pid label. Clear the directory when the server starts.
+"""
+
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help)
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by method, route template and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by method and route template."),
+    "http_requests_in_flight": ("gauge", "HTTP requests currently being served."),
+    "db_pool_connections": ("gauge", "Database pool connections by state."),
+    "db_pool_checkouts_total": ("counter", "Database pool checkouts."),
+    "db_pool_checkout_timeouts_total": ("counter", "Database pool checkouts that timed out."),
+    "db_pool_checkout_wait_seconds_total": ("counter", "Time spent waiting for a pool connection."),
+    "cache_hits_total": ("counter", "Cache hits (including 304 responses for the response cache)."),
+    "cache_misses_total": ("counter", "Cache misses."),
+    "cache_hit_ratio": ("gauge", "Cache hit ratio since start, over all workers."),
+    "password_hash_queue_depth": ("gauge", "Password hashing requests running or waiting."),
+    "password_hash_rejected_total": ("counter", "Password hashing requests rejected with 429."),
+}
+
+# Series keys are (metric name, rendered label string)
+SeriesKey = Tuple[str, str]
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{str(value)}"' for name, value in labels.items())
+
+class MetricsRegistry:
+    """Counters, gauges and latency histograms of this process."""
+    
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_seconds: float = 5.0):
+        self._lock = threading.Lock()
+        self._counters: Dict[SeriesKey, float] = {}
+        self._histograms: Dict[SeriesKey, list] = {}
+        # (method, route, status) -> rendered series keys, so requests skip label formatting
+        self._request_keys: Dict[tuple, Tuple[SeriesKey, SeriesKey]] = {}
+        self.in_flight = 0
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_seconds = flush_seconds
+        self._flusher = None
+        self._snapshot_path = None
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+            self._snapshot_path = os.path.join(multiprocess_dir, f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+    
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        """Count one finished request and add its latency to the route's histogram."""
+        keys = self._request_keys.get((method, route, status))
+        if keys is None:
+            keys = self._request_keys[(method, route, status)] = (
+                ("http_requests_total", _labels(method=method, route=route, status=status)),
+                ("http_request_duration_seconds", _labels(method=method, route=route)),
+            )
+        counter_key, histogram_key = keys
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self._counters[counter_key] = self._counters.get(counter_key, 0) + 1
+            histogram = self._histograms.get(histogram_key)
+            if histogram is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                histogram = self._histograms[histogram_key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0]
+            histogram[0][bucket] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+        if self.multiprocess_dir and self._flusher is None:
+            self._start_flusher()
+    
+    def snapshot(self) -> dict:
+        """Copy of this process's series, including stats collected from the app."""
+        counters, gauges = _collect_app_stats()
+        gauges[("http_requests_in_flight", "")] = self.in_flight
+        with self._lock:
+            counters.update(self._counters)
+            histograms = {key: [list(value[0]), value[1], value[2]] for key, value in self._histograms.items()}
+        return {"pid": os.getpid(), "counters": counters, "gauges": gauges, "histograms": histograms}
+    
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_forever, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+    
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except OSError:
+                pass
+    
+    def flush(self):
+        """Write this process's snapshot to the multiprocess directory."""
+        snapshot = self.snapshot()
+        encoded = {
+            "pid": snapshot["pid"],
+            **{kind: [[name, labels, value] for (name, labels), value in snapshot[kind].items()]
+               for kind in ("counters", "gauges", "histograms")}
+        }
+        temporary = self._snapshot_path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(encoded, f)
+        os.replace(temporary, self._snapshot_path)
+    
+    def _worker_snapshots(self) -> List[dict]:
+        """This process's live snapshot plus the files written by the other workers."""
+        own = self.snapshot()
+        snapshots = [own]
+        if not self.multiprocess_dir:
+            return snapshots
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics-*.json")):
+            if path == self._snapshot_path:
+                continue
+            try:
+                with open(path) as f:
+                    encoded = json.load(f)
+            except (OSError, ValueError):
+                continue
+            snapshots.append({
+                "pid": encoded["pid"],
+                **{kind: {(name, labels): value for name, labels, value in encoded[kind]}
+                   for kind in ("counters", "gauges", "histograms")}
+            })
+        return snapshots
+    
+    def render(self) -> str:
+        """Merge all workers' series and render them in the Prometheus text format."""
+        counters: Dict[SeriesKey, float] = {}
+        gauges: Dict[SeriesKey, float] = {}
+        histograms: Dict[SeriesKey, list] = {}
+        for snapshot in self._worker_snapshots():
+            for key, value in snapshot["counters"].items():
+                counters[key] = counters.get(key, 0) + value
+            for key, (buckets, total, count) in snapshot["histograms"].items():
+                merged = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+                merged[1] += total
+                merged[2] += count
+            if snapshot["pid"] == os.getpid() or _process_alive(snapshot["pid"]):
+                pid_label = _labels(pid=snapshot["pid"])
+                for (name, labels), value in snapshot["gauges"].items():
+                    gauges[(name, f"{labels},{pid_label}" if labels else pid_label)] = value
+        
+        # Hit ratios are computed from the summed counters, so they cover every worker
+        for (name, labels), hits in list(counters.items()):
+            if name == "cache_hits_total":
+                total = hits + counters.get(("cache_misses_total", labels), 0)
+                gauges[("cache_hit_ratio", labels)] = hits / total if total else 0.0
+        
+        series: Dict[str, List[str]] = {}
+        for (name, labels), value in sorted(counters.items()):
+            series.setdefault(name, []).append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+        for (name, labels), value in sorted(gauges.items()):
+            series.setdefault(name, []).append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+        for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+            lines = series.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {total}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+        
+        output = []
+        for name in sorted(series):
+            metric_type, help_text = METRICS[name]
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(series[name])
+        return "\n".join(output) + "\n"
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _collect_app_stats() -> Tuple[Dict[SeriesKey, float], Dict[SeriesKey, float]]:
+    """Read pool, cache and password hashing stats of this process as metric series."""
+    from app.core.cache import user_cache
+    from app.core.database import engine, async_engine
+    from app.core.pool import pool_stats
+    from app.core.response_cache import response_cache
+    from app.core.security import password_pool
+    
+    counters: Dict[SeriesKey, float] = {}
+    gauges: Dict[SeriesKey, float] = {}
+    engines = [("sync", engine)] + ([("async", async_engine)] if async_engine is not None else [])
+    for engine_name, db_engine in engines:
+        stats = pool_stats(db_engine.pool)
+        for state in ("checked_out", "idle", "overflow"):
+            if state in stats:
+                gauges[("db_pool_connections", _labels(engine=engine_name, state=state))] = stats[state]
+        if "checkouts" in stats:
+            counters[("db_pool_checkouts_total", _labels(engine=engine_name))] = stats["checkouts"]
+            counters[("db_pool_checkout_timeouts_total", _labels(engine=engine_name))] = stats["checkout_timeouts"]
+            counters[("db_pool_checkout_wait_seconds_total", _labels(engine=engine_name))] = db_engine.pool.total_wait_seconds
+    
+    user_stats = user_cache.stats()
+    response_stats = response_cache.stats()
+    for cache_name, hits, misses in (
+        ("user", user_stats["hits"], user_stats["misses"]),
+        ("response", response_stats["hits"] + response_stats["not_modified"], response_stats["misses"]),
+    ):
+        counters[("cache_hits_total", _labels(cache=cache_name))] = hits
+        counters[("cache_misses_total", _labels(cache=cache_name))] = misses
+    
+    gauges[("password_hash_queue_depth", "")] = password_pool.queue_depth()
+    counters[("password_hash_rejected_total", "")] = password_pool.rejected
+    return counters, gauges
+
+metrics_registry = MetricsRegistry(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+
+class MetricsMiddleware:
+    """Record latency, status and in-flight count of every HTTP request."""
+    
+    def __init__(self, app, registry: MetricsRegistry = None):
+        self.app = app
+        self.registry = registry or metrics_registry
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        # Only the event loop thread touches in_flight, so no lock is needed
+        self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.in_flight -= 1
+            # The route template keeps label cardinality bounded; unmatched paths share one label
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"], getattr(route, "path", "<unmatched>"), status_code, time.perf_counter() - started
+            )
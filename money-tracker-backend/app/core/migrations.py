@@ -0,0 +1,305 @@
+"""
+Versioned schema migrations.
+
+Every module in app/migrations named NNNN_description.py is a migration: it defines
+upgrade(ctx) and the first line of its docstring describes it. upgrade() applies the
+pending ones in version order and records each in the schema_migrations table.
+
+Migrations run against live, possibly large tables, so they are not wrapped in one
+transaction: every step commits on its own, and a migration must be safe to re-run from
+the start if it was interrupted. MigrationContext provides the online building blocks:
+
+- create_index/drop_index build and drop indexes CONCURRENTLY on PostgreSQL, so writes
+  to the table are never blocked.
+- Other DDL runs with a short lock_timeout and is retried, so an ALTER TABLE waiting behind
+  a long transaction gives up instead of queueing every other query on the table.
+- backfill updates rows in primary key ranges of batch_size, committing and sleeping
+  between batches.
+- change_column_type converts a column by expand/backfill/contract: a new column kept in
+  sync by a trigger, backfilled in batches, then swapped in with one short transaction.
+"""
+
+import contextlib
+import importlib
+import logging
+import pkgutil
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+
+logger = logging.getLogger("money_tracker.migrations")
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", String(32), primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Key of the PostgreSQL advisory lock that keeps two deploys from migrating at once
+ADVISORY_LOCK_KEY = 727001
+# SQLSTATE lock_not_available: lock_timeout expired
+LOCK_NOT_AVAILABLE = "55P03"
+LOCK_RETRIES = 5
+# Seconds between backfill progress lines
+PROGRESS_SECONDS = 10
+
+class Migration:
+    """One migration module: its version, description and upgrade function."""
+    
+    def __init__(self, version: str, description: str, upgrade: Callable):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+def load_migrations(package: str = "app.migrations") -> List[Migration]:
+    """Import every migration module of the package, sorted by version."""
+    module = importlib.import_module(package)
+    migrations = []
+    for info in pkgutil.iter_modules(module.__path__):
+        version = info.name.split("_", 1)[0]
+        if not version.isdigit():
+            continue
+        migration_module = importlib.import_module(f"{package}.{info.name}")
+        description = (migration_module.__doc__ or info.name).strip().splitlines()[0]
+        migrations.append(Migration(version, description, migration_module.upgrade))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {package}: {versions}")
+    return migrations
+
+def applied_versions(engine: Engine) -> Dict[str, datetime]:
+    """Versions recorded in schema_migrations, with the time each was applied."""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at))
+        return {row.version: row.applied_at for row in rows}
+
+def pending_migrations(engine: Engine, target: Optional[str] = None) -> List[Migration]:
+    """Migrations up to target (all by default) that are not applied yet."""
+    applied = applied_versions(engine)
+    return [
+        migration for migration in load_migrations()
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+def ensure_schema(engine: Engine, mode: str):
+    """Startup schema hook: "check" fails if migrations are pending, "migrate" applies them."""
+    if mode == "check":
+        pending = pending_migrations(engine)
+        if pending:
+            versions = ", ".join(migration.version for migration in pending)
+            raise RuntimeError(f"Database schema is out of date (pending migrations: {versions}); run scripts/migrate.py")
+    elif mode == "migrate":
+        upgrade(engine, log=logger.info)
+    elif mode != "off":
+        raise ValueError(f"Unknown DB_SCHEMA_ON_STARTUP mode: {mode!r}")
+
+@contextlib.contextmanager
+def _migration_lock(engine: Engine):
+    """Hold a session-level advisory lock on PostgreSQL while migrating."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            conn.commit()
+
+def upgrade(
+    engine: Engine,
+    target: Optional[str] = None,
+    batch_size: int = None,
+    batch_sleep: float = None,
+    log: Callable = print
+) -> List[Migration]:
+    """Apply pending migrations up to target (all by default) and return them."""
+    with _migration_lock(engine):
+        pending = pending_migrations(engine, target)
+        ctx = MigrationContext(engine, batch_size, batch_sleep, log)
+        for migration in pending:
+            log(f"🔄 {migration.version} {migration.description}")
+            started = time.perf_counter()
+            migration.upgrade(ctx)
+            with engine.begin() as conn:
+                conn.execute(schema_migrations.insert().values(
+                    version=migration.version, description=migration.description, applied_at=datetime.utcnow()
+                ))
+            log(f"✅ {migration.version} applied in {time.perf_counter() - started:.1f}s")
+        return pending
+
+class MigrationContext:
+    """Online schema change helpers handed to each migration's upgrade()."""
+    
+    def __init__(self, engine: Engine, batch_size: int = None, batch_sleep: float = None, log: Callable = print):
+        self.engine = engine
+        self.batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+        self.batch_sleep = settings.MIGRATION_BATCH_SLEEP_MS / 1000 if batch_sleep is None else batch_sleep
+        self.log = log
+    
+    @property
+    def is_postgresql(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+    
+    def has_table(self, table: str) -> bool:
+        return inspect(self.engine).has_table(table)
+    
+    def columns(self, table: str) -> Dict[str, dict]:
+        """Reflected columns of a table by name."""
+        return {column["name"]: column for column in inspect(self.engine).get_columns(table)}
+    
+    def execute(self, sql: str, **params) -> int:
+        """Run one statement in its own transaction and return its row count."""
+        return self.transaction((sql, params))
+    
+    def transaction(self, *statements) -> int:
+        """Run statements (SQL strings or (sql, params) pairs) in one transaction.
+        
+        On PostgreSQL the transaction gets MIGRATION_LOCK_TIMEOUT_MS as lock_timeout and is
+        retried with backoff when a lock cannot be taken in time. Returns the row count of
+        the last statement.
+        """
+        for attempt in range(1, LOCK_RETRIES + 1):
+            try:
+                with self.engine.begin() as conn:
+                    if self.is_postgresql:
+                        conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(settings.MIGRATION_LOCK_TIMEOUT_MS)}")
+                    rowcount = 0
+                    for statement in statements:
+                        sql, params = (statement, {}) if isinstance(statement, str) else statement
+                        rowcount = conn.execute(text(sql), params).rowcount
+                    return rowcount
+            except OperationalError as e:
+                if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or attempt == LOCK_RETRIES:
+                    raise
+                self.log(f"⏳ Lock not available, retrying ({attempt}/{LOCK_RETRIES - 1})")
+                time.sleep(attempt)
+    
+    def _autocommit(self, sql: str):
+        """Run a statement outside a transaction (required by CONCURRENTLY)."""
+        with self.engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(sql)
+    
+    def create_index(self, name: str, table: str, columns: List[str], unique: bool = False, where: str = None):
+        """Create an index unless it exists, without blocking writes on PostgreSQL."""
+        ddl = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {{}}IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+            + (f" WHERE {where}" if where else "")
+        )
+        if not self.is_postgresql:
+            self.execute(ddl.format(""))
+            return
+        
+        # An interrupted concurrent build leaves an INVALID index that IF NOT EXISTS would keep
+        with self.engine.connect() as conn:
+            invalid = conn.execute(text(
+                "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name"
+            ), {"name": name}).scalar()
+        if invalid:
+            self.log(f"   dropping invalid index {name}")
+            self._autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        self._autocommit(ddl.format("CONCURRENTLY "))
+    
+    def drop_index(self, name: str):
+        """Drop an index if it exists, without blocking writes on PostgreSQL."""
+        if self.is_postgresql:
+            self._autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        else:
+            self.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    def add_column(self, table: str, column: str, type_sql: str) -> bool:
+        """Add a nullable column without a default (a catalog-only change) unless it exists."""
+        if column in self.columns(table):
+            return False
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {column} {type_sql}")
+        return True
+    
+    def batches(self, table: str, key: str = "id") -> Iterator[Tuple[int, int]]:
+        """Yield [low, high) ranges of an integer key covering the table, throttled.
+        
+        The caller commits its work for a range before asking for the next one; this
+        sleeps batch_sleep between ranges and logs progress.
+        """
+        with self.engine.connect() as conn:
+            low, high = conn.execute(text(f"SELECT min({key}), max({key}) FROM {table}")).one()
+        if low is None:
+            return
+        
+        reported = time.monotonic()
+        for start in range(low, high + 1, self.batch_size):
+            yield start, start + self.batch_size
+            if time.monotonic() - reported >= PROGRESS_SECONDS:
+                reported = time.monotonic()
+                self.log(f"   {table}: {key} {start + self.batch_size}/{high}")
+            time.sleep(self.batch_sleep)
+    
+    def backfill(self, table: str, assignments: str, where: str = None, key: str = "id") -> int:
+        """UPDATE table SET assignments in committed key-range batches; returns rows updated."""
+        condition = f"{key} >= :low AND {key} < :high" + (f" AND ({where})" if where else "")
+        updated = 0
+        for low, high in self.batches(table, key):
+            updated += self.execute(f"UPDATE {table} SET {assignments} WHERE {condition}", low=low, high=high)
+        self.log(f"   {table}: backfilled {updated} rows")
+        return updated
+    
+    def change_column_type(self, table: str, column: str, type_, using: str = "{column}") -> bool:
+        """Convert a column to a SQLAlchemy type; using maps {column} to the new value.
+        
+        On PostgreSQL the column is rebuilt as column__new, kept current by a trigger
+        while existing rows are backfilled in batches; NOT NULL is validated through a
+        NOT VALID check constraint, then the old column is dropped and the new one renamed
+        in a single short transaction. Indexes and server defaults on the column are not
+        carried over. SQLite only has type affinities, so there the stored values are
+        converted in place. Returns False when the column already has the type.
+        """
+        target = type_.compile(dialect=self.engine.dialect)
+        info = self.columns(table)[column]
+        if info["type"].compile(dialect=self.engine.dialect) == target:
+            return False
+        if not self.is_postgresql:
+            self.backfill(table, f"{column} = {using.format(column=column)}")
+            return True
+        
+        new_column = f"{column}__new"
+        function = f"{table}_{column}__sync"
+        constraint = f"{table}_{column}__not_null"
+        self.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {new_column} {target}")
+        self.execute(
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$ BEGIN "
+            f"NEW.{new_column} := {using.format(column='NEW.' + column)}; RETURN NEW; END $$ LANGUAGE plpgsql"
+        )
+        self.transaction(
+            f"DROP TRIGGER IF EXISTS {function} ON {table}",
+            f"CREATE TRIGGER {function} BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {function}()"
+        )
+        self.backfill(table, f"{new_column} = {using.format(column=column)}")
+        
+        swap = [
+            f"DROP TRIGGER {function} ON {table}",
+            f"ALTER TABLE {table} DROP COLUMN {column}",
+            f"ALTER TABLE {table} RENAME COLUMN {new_column} TO {column}",
+        ]
+        if not info["nullable"]:
+            # VALIDATE scans without blocking writes; SET NOT NULL then trusts the constraint
+            self.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}")
+            self.execute(f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({new_column} IS NOT NULL) NOT VALID")
+            self.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+            swap += [
+                f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL",
+                f"ALTER TABLE {table} DROP CONSTRAINT {constraint}",
+            ]
+        self.transaction(*swap)
+        self.execute(f"DROP FUNCTION IF EXISTS {function}()")
+        return True
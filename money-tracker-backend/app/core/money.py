@@ -0,0 +1,39 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from sqlalchemy import Float, Numeric, cast, func
+
+# Column type for every money amount: exact decimal with two fractional digits
+Money = Numeric(18, 2)
+
+CENT = Decimal("0.01")
+
+# Largest magnitude (exclusive) that fits Numeric(18, 2)
+MONEY_LIMIT = Decimal(10) ** 16
+
+def to_money(value) -> Decimal:
+    """Convert a number or numeric string to a Decimal rounded to whole cents."""
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid money amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"invalid money amount: {value!r}")
+    try:
+        amount = amount.quantize(CENT, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        # Too many digits for the decimal context, e.g. "1e400"
+        raise ValueError(f"money amount out of range: {value!r}")
+    if abs(amount) >= MONEY_LIMIT:
+        raise ValueError(f"money amount out of range: {value!r}")
+    return amount
+
+def plain_number(value):
+    """Turn an exact Decimal total into a float for JSON responses; other values pass through."""
+    return float(value) if isinstance(value, Decimal) else value
+
+def money_as_float(column):
+    """SQL expression for a money column as a float, for rows serialized without the ORM.
+    
+    Rounding to cents before the cast keeps SQLite's REAL arithmetic (e.g. 44.500000000000014)
+    out of the output, matching the Decimal values the ORM returns.
+    """
+    return cast(func.round(column, 2), Float)
@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+def encode_cursor(date: datetime, item_id: int) -> str:
+    """Encode a (date, id) keyset position into an opaque cursor string."""
+    raw = json.dumps([date.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(date_str), int(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def next_cursor(items: list, limit: int) -> Optional[str]:
+    """Return the cursor for the page after items, or None if this is the last page."""
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last.date, last.id)
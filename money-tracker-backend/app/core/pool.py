@@ -0,0 +1,53 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+def pool_stats(pool) -> dict:
+    """Return connection usage for a QueuePool, plus wait times when instrumented."""
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+    
+    stats = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "checkout_timeouts": pool.checkout_timeouts,
+            "avg_wait_ms": pool.total_wait_seconds / pool.checkouts * 1000 if pool.checkouts else 0.0,
+            "max_wait_ms": pool.max_wait_seconds * 1000,
+        })
+    return stats
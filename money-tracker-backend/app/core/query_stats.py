@@ -0,0 +1,143 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor events on the engines count statements and time them into the stats object of
+the request being served, which QueryStatsMiddleware keeps in a context variable (worker
+threads running sync handlers get a copy of the context, so they see the same object).
+Each request ends with one JSON log line; in debug mode the numbers are also sent as a
+Server-Timing header. Statements slower than SLOW_QUERY_MS are logged with their plan,
+inside or outside a request.
+"""
+
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("money_tracker.requests")
+slow_query_logger = logging.getLogger("money_tracker.slow_queries")
+
+class QueryStats:
+    """Statement count, total database time and slowest statement of one request."""
+    
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+    
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def _compact(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+def _explain(conn, statement: str, parameters) -> str:
+    """Plan of a statement on the connection that just ran it (never executes it again)."""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    conn.info["explaining"] = True
+    try:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    finally:
+        conn.info["explaining"] = False
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started_at"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started_at"]
+    if conn.info.get("explaining"):
+        return
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    
+    if not settings.SLOW_QUERY_MS or seconds * 1000 < settings.SLOW_QUERY_MS:
+        return
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and statement.lstrip()[:6].upper() in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+    slow_query_logger.warning(json.dumps({
+        "event": "slow_query",
+        "duration_ms": round(seconds * 1000, 2),
+        "statement": _compact(statement),
+        "plan": plan
+    }))
+
+def instrument_engine(engine: Engine):
+    """Attach the statement counters and slow query log to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class QueryStatsMiddleware:
+    """Collect per-request query stats, log them, and send Server-Timing in debug mode."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", self._server_timing(stats, started).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if logger.isEnabledFor(logging.INFO):
+                self._log(scope, status_code, started, stats)
+    
+    @staticmethod
+    def _log(scope, status_code: int, started: float, stats: QueryStats):
+        route = scope.get("route")
+        logger.info(json.dumps({
+            "event": "request",
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "db_queries": stats.count,
+            "db_ms": round(stats.total_seconds * 1000, 2),
+            "db_slowest_ms": round(stats.slowest_seconds * 1000, 2),
+            "db_slowest_statement": _compact(stats.slowest_statement, 200) if stats.slowest_statement else None
+        }))
+    
+    @staticmethod
+    def _server_timing(stats: QueryStats, started: float) -> str:
+        # Statements issued after the response starts (session close) are only in the log line
+        return (
+            f'db;dur={stats.total_seconds * 1000:.2f};desc="{stats.count} queries", '
+            f"db-slowest;dur={stats.slowest_seconds * 1000:.2f}, "
+            f"app;dur={(time.perf_counter() - started) * 1000:.2f}"
+        )
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import uuid
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheBackend, InProcessBackend, create_backend
+from app.core.config import settings
+
+class DataVersions:
+    """Per-user version token that changes whenever one of the user's rows changes."""
+    
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+    
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"data-version:{user_id}"
+    
+    def get(self, user_id: int) -> str:
+        """Return the current version, starting a new one if none is stored."""
+        version = self.backend.get(self._key(user_id))
+        if version is None:
+            version = self.bump(user_id)
+        return version
+    
+    def bump(self, user_id: int) -> str:
+        """Replace the version so every cached response for the user goes stale."""
+        # A random token rather than a counter: losing the entry can only cause a miss
+        version = uuid.uuid4().hex
+        self.backend.set(self._key(user_id), version, self.ttl)
+        return version
+
+class CacheLookup:
+    """Outcome of ResponseCache.lookup: the ETag, plus a ready response on a hit."""
+    
+    def __init__(self, key: str, etag: str, response: Optional[Response] = None):
+        self.key = key
+        self.etag = etag
+        self.response = response
+
+class ResponseCache:
+    """In-process LRU of rendered JSON bodies, keyed by user data version and URL."""
+    
+    def __init__(self, versions: DataVersions, max_size: int, ttl: int):
+        self.versions = versions
+        self.ttl = ttl
+        self._bodies = InProcessBackend(max_size)
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+    
+    def _headers(self, etag: str) -> dict:
+        # Clients must revalidate, and shared caches must not store per-user data
+        return {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    def lookup(self, request: Request, user_id: int) -> CacheLookup:
+        """Answer from the cache when possible, without touching the database.
+        
+        Returns a 304 response when If-None-Match carries the current ETag, a 200 response
+        when the body for the current version is cached, and no response otherwise.
+        """
+        url = request.url.path + ("?" + request.url.query if request.url.query else "")
+        version = self.versions.get(user_id)
+        key = f"{user_id}:{version}:{url}"
+        etag = f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+        
+        if etag in request.headers.get("if-none-match", ""):
+            with self._lock:
+                self.not_modified += 1
+            return CacheLookup(key, etag, Response(status_code=304, headers=self._headers(etag)))
+        
+        body = self._bodies.get(key)
+        with self._lock:
+            if body is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if body is not None:
+            return CacheLookup(key, etag, self._response(body, etag))
+        return CacheLookup(key, etag)
+    
+    def store(self, lookup: CacheLookup, data: Any, response_model: Any = None) -> Response:
+        """Render data like the route's response_model would, cache the body and return it."""
+        if response_model is not None:
+            adapter = _type_adapter(response_model)
+            body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        else:
+            body = _type_adapter(Any).dump_json(data)
+        self._bodies.set(lookup.key, body, self.ttl)
+        return self._response(body, lookup.etag)
+    
+    def _response(self, body: bytes, etag: str) -> Response:
+        return Response(content=body, media_type="application/json", headers=self._headers(etag))
+    
+    def stats(self) -> dict:
+        """Return hit/miss/304 counters for this process."""
+        total = self.hits + self.misses + self.not_modified
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_ratio": (self.hits + self.not_modified) / total if total else 0.0
+        }
+
+@lru_cache(maxsize=None)
+def _type_adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+data_versions = DataVersions(create_backend(settings.DATA_VERSION_BACKEND), settings.RESPONSE_CACHE_TTL_SECONDS)
+response_cache = ResponseCache(data_versions, settings.RESPONSE_CACHE_MAX_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+def mark_user_changed(db: Session, user_id: int):
+    """Record that the session changed a user's data; the version is bumped on commit."""
+    db.info.setdefault("changed_users", set()).add(user_id)
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_users(session):
+    """Bump versions only once the change is visible to other sessions."""
+    for user_id in session.info.pop("changed_users", ()):
+        data_versions.bump(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_users", None)
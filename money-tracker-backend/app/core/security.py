@@ -1,25 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.cache import user_cache
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt work.
+    
+    bcrypt releases the GIL, so a few dedicated threads hash in parallel. Requests beyond
+    the queue limit are rejected with 429 instead of piling up on the shared threadpool
+    and stalling every other endpoint.
+    """
+    
+    def __init__(self, workers: int, queue_limit: int):
+        self.capacity = workers + queue_limit
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    
+    def run(self, fn, *args):
+        """Run fn(*args) on the pool and wait for the result."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many concurrent authentication requests, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def queue_depth(self) -> int:
+        """Number of password operations running or waiting."""
+        return self._in_flight
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
+
+# passlib and python-jose (with its cryptography backend) are imported on first use, so
+# importing the app and starting a worker does not pay for them
+_pwd_context = None
+
+def password_context():
+    """The bcrypt CryptContext, created on first use."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.run(password_context().verify, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    return password_pool.run(password_context().hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
@@ -29,25 +80,59 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get current authenticated user."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised for any invalid or unknown token."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_token(token: str) -> Tuple[str, Optional[int]]:
+    """Return the (username, uid) claims of a valid token or raise 401."""
+    from jose import JWTError, jwt
+    credentials_exception = _credentials_exception()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
+        user_id: Optional[int] = payload.get("uid")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.username == username).first()
+    return username, user_id
+
+def _load_user(user: Optional[User]) -> User:
+    """Cache a user loaded from the database, or raise 401 if it does not exist."""
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    user_cache.set(user)
     return user
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """Get current authenticated user."""
+    username, user_id = _decode_token(token)
+    
+    # Tokens carrying a uid claim can be served from the cache without a DB query
+    if user_id is not None:
+        user = user_cache.get(user_id, username)
+        if user is not None:
+            return user
+    
+    return _load_user(db.query(User).filter(User.username == username).first())
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db = Depends(get_async_db)) -> User:
+    """Get current authenticated user on the async request path."""
+    username, user_id = _decode_token(token)
+    
+    if user_id is not None:
+        user = user_cache.get(user_id, username)
+        if user is not None:
+            return user
+    
+    result = await db.execute(select(User).where(User.username == username))
+    return _load_user(result.scalars().first())
@@ -0,0 +1,41 @@
+"""
+Row serializers for the list endpoints.
+
+Instead of loading ORM instances and re-validating each one through the response model,
+the list queries select exactly the columns behind the response schema's fields and the
+rows are turned into plain dicts for ORJSONResponse. The output matches what the
+response_model would have produced.
+"""
+
+from typing import Any, List, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Numeric, inspect
+
+from app.core.money import money_as_float
+
+def response_columns(entity: Any, schema: Type[BaseModel], prefix: str = "") -> list:
+    """Select the columns behind a schema's fields, labelled prefix + field name.
+    
+    Money columns are rounded to cents and cast to float in SQL so they serialize like
+    the schema's float fields. Fields without a matching column (e.g. nested
+    relationships) are skipped.
+    """
+    mapper_columns = inspect(entity).mapper.columns
+    columns = []
+    for name in schema.model_fields:
+        if name not in mapper_columns:
+            continue
+        column = getattr(entity, name)
+        if isinstance(mapper_columns[name].type, Numeric):
+            column = money_as_float(column)
+        columns.append(column.label(prefix + name))
+    return columns
+
+def rows_to_dicts(rows) -> List[dict]:
+    """Turn result rows into dicts keyed by their column labels."""
+    return [row._asdict() for row in rows]
+
+def nest(item: dict, prefix: str) -> dict:
+    """Move the prefix-labelled keys of a row dict into a nested dict."""
+    return {key[len(prefix):]: item.pop(key) for key in [key for key in item if key.startswith(prefix)]}
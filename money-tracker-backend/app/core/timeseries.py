@@ -0,0 +1,48 @@
+"""
+Time buckets for the analytics series.
+
+A bucket is identified by its first day: the day itself, the Monday of its week, or the
+first of its month. bucket_expression computes that date in SQL so rows can be grouped
+by bucket in the database, and bucket_starts lists every bucket of a range so that
+buckets without rows can be filled with zeros.
+"""
+
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import Date, cast, func, type_coerce
+
+INTERVALS = ("day", "week", "month")
+
+def bucket_start(interval: str, value: date) -> date:
+    """First day of the bucket containing value."""
+    if interval == "week":
+        return value - timedelta(days=value.weekday())
+    if interval == "month":
+        return value.replace(day=1)
+    return value
+
+def next_bucket(interval: str, value: date) -> date:
+    """First day of the bucket after the one starting at value."""
+    if interval == "week":
+        return value + timedelta(days=7)
+    if interval == "month":
+        return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return value + timedelta(days=1)
+
+def bucket_starts(interval: str, start: date, end: date) -> List[date]:
+    """Every bucket from the one containing start to the one containing end."""
+    buckets = []
+    current = bucket_start(interval, start)
+    while current <= end:
+        buckets.append(current)
+        current = next_bucket(interval, current)
+    return buckets
+
+def bucket_expression(dialect_name: str, interval: str, column):
+    """SQL expression for the first day of a datetime column's bucket, as a DATE."""
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc(interval, column), Date)
+    # SQLite: date() modifiers; "-6 days, weekday 1" lands on the Monday on or before
+    modifiers = {"day": (), "week": ("-6 days", "weekday 1"), "month": ("start of month",)}[interval]
+    return type_coerce(func.date(column, *modifiers), Date)
@@ -0,0 +1,75 @@
+"""Create the users, wallets, transactions, transfers and adjustments tables."""
+
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table
+
+# The tables as first released; later migrations change them. Frozen here rather than
+# taken from app.models, which always describe the latest schema.
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, index=True),
+    Column("email", String, unique=True, index=True),
+    Column("hashed_password", String),
+    Column("created_at", DateTime, default=datetime.utcnow),
+)
+
+Table(
+    "wallets", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("wallet_type", String, nullable=False),
+    Column("icon", String),
+    Column("color", String),
+    Column("balance", Float),
+    Column("is_default", Boolean),
+    Column("is_active", Boolean),
+    Column("description", String),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("user_id", Integer, ForeignKey("users.id")),
+)
+
+Table(
+    "transactions", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("amount", Float),
+    Column("category", String),
+    Column("description", String),
+    Column("transaction_type", String),
+    Column("date", DateTime),
+    Column("created_at", DateTime),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("wallet_id", Integer, ForeignKey("wallets.id")),
+)
+
+Table(
+    "wallet_transfers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("amount", Float, nullable=False),
+    Column("description", String),
+    Column("transfer_date", DateTime),
+    Column("created_at", DateTime),
+    Column("from_wallet_id", Integer, ForeignKey("wallets.id")),
+    Column("to_wallet_id", Integer, ForeignKey("wallets.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+)
+
+Table(
+    "balance_adjustments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("wallet_id", Integer, ForeignKey("wallets.id")),
+    Column("old_balance", Float, nullable=False),
+    Column("new_balance", Float, nullable=False),
+    Column("adjustment_amount", Float, nullable=False),
+    Column("reason", String),
+    Column("adjusted_at", DateTime),
+    Column("user_id", Integer, ForeignKey("users.id")),
+)
+
+def upgrade(ctx):
+    # Tables that already exist (databases created before migrations) are left alone
+    metadata.create_all(ctx.engine, checkfirst=True)
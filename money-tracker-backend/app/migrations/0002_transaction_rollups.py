@@ -0,0 +1,35 @@
+"""Add the monthly transaction_rollups table and backfill it."""
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint
+
+from app.migrations._rollups import rebuild_rollups
+
+metadata = MetaData()
+
+# Only the referenced keys, for the foreign keys below
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("wallets", metadata, Column("id", Integer, primary_key=True))
+
+transaction_rollups = Table(
+    "transaction_rollups", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("wallet_id", Integer, ForeignKey("wallets.id")),
+    Column("category", String),
+    Column("transaction_type", String),
+    Column("period", Date, nullable=False),
+    Column("total_amount", Float, nullable=False),
+    Column("transaction_count", Integer, nullable=False),
+    UniqueConstraint(
+        "user_id", "wallet_id", "category", "transaction_type", "period",
+        name="uq_transaction_rollups_key"
+    ),
+)
+
+def upgrade(ctx):
+    # A table that already exists is kept current by the application. If this migration
+    # is interrupted during the backfill, finish it with scripts/rebuild_rollups.py.
+    if ctx.has_table("transaction_rollups"):
+        return
+    transaction_rollups.create(ctx.engine)
+    rebuild_rollups(ctx)
@@ -0,0 +1,15 @@
+"""Add the composite indexes behind the paginated listings, dashboard and analytics."""
+
+def upgrade(ctx):
+    ctx.create_index("ix_transactions_user_date_id", "transactions", ["user_id", "date", "id"])
+    ctx.create_index("ix_transactions_user_category_date_id", "transactions", ["user_id", "category", "date", "id"])
+    ctx.create_index("ix_transactions_user_created_at", "transactions", ["user_id", "created_at"])
+    ctx.create_index("ix_transactions_wallet_date_id", "transactions", ["wallet_id", "date", "id"])
+    ctx.create_index("ix_wallets_user_created_at", "wallets", ["user_id", "created_at"])
+    ctx.create_index(
+        "ix_wallets_user_default_active", "wallets", ["user_id"], where="is_default AND is_active"
+    )
+    ctx.create_index("ix_wallet_transfers_user_transfer_date", "wallet_transfers", ["user_id", "transfer_date", "id"])
+    ctx.create_index(
+        "ix_balance_adjustments_wallet_adjusted_at", "balance_adjustments", ["wallet_id", "adjusted_at", "id"]
+    )
@@ -0,0 +1,26 @@
+"""Convert the money columns from floating point to exact NUMERIC(18,2)."""
+
+from sqlalchemy import Numeric
+
+from app.migrations._rollups import rebuild_rollups
+
+MONEY_COLUMNS = {
+    "transactions": ["amount"],
+    "transaction_rollups": ["total_amount"],
+    "wallets": ["balance"],
+    "wallet_transfers": ["amount"],
+    "balance_adjustments": ["old_balance", "new_balance", "adjustment_amount"],
+}
+
+def upgrade(ctx):
+    using = "round({column}::numeric, 2)" if ctx.is_postgresql else "ROUND({column}, 2)"
+    converted = False
+    for table, columns in MONEY_COLUMNS.items():
+        for column in columns:
+            if ctx.change_column_type(table, column, Numeric(18, 2), using):
+                ctx.log(f"   {table}.{column} -> NUMERIC(18,2)")
+                converted = True
+    
+    # Per-month totals must match the rounded amounts exactly
+    if converted:
+        rebuild_rollups(ctx)
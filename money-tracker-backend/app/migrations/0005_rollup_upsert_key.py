@@ -0,0 +1,29 @@
+"""Key transaction_rollups on a unique index that treats NULL wallets and categories as equal."""
+
+from sqlalchemy import text
+
+from app.migrations._rollups import rebuild_user_rollups
+
+KEY = "user_id, COALESCE(wallet_id, 0), COALESCE(category, ''), COALESCE(transaction_type, ''), period"
+
+def upgrade(ctx):
+    # The old unique constraint let NULL keys repeat; recompute the users that have such
+    # duplicates, or the unique index cannot be built
+    with ctx.engine.connect() as conn:
+        user_ids = conn.execute(text(
+            f"SELECT DISTINCT user_id FROM transaction_rollups GROUP BY {KEY} HAVING COUNT(*) > 1"
+        )).scalars().all()
+    for user_id in user_ids:
+        rebuild_user_rollups(ctx, user_id)
+    if user_ids:
+        ctx.log(f"   merged duplicate rollups of {len(user_ids)} user(s)")
+    
+    ctx.create_index(
+        "ux_transaction_rollups_key", "transaction_rollups",
+        ["user_id", "COALESCE(wallet_id, 0)", "COALESCE(category, '')", "COALESCE(transaction_type, '')", "period"],
+        unique=True
+    )
+    # SQLite cannot drop a table constraint in place; there the old one stays, and is
+    # implied by the new index
+    if ctx.is_postgresql:
+        ctx.execute("ALTER TABLE transaction_rollups DROP CONSTRAINT IF EXISTS uq_transaction_rollups_key")
@@ -0,0 +1,7 @@
+"""
+Schema migrations, applied in version order by scripts/migrate.py.
+
+The models describe the current schema; every change to a table or index on them needs a
+new NNNN_description.py here so existing databases get it too. See app/core/migrations.py
+for the helpers a migration's upgrade(ctx) can use.
+"""
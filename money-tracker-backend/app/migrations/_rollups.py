@@ -0,0 +1,38 @@
+"""Rollup backfill shared by the migrations that (re)populate transaction_rollups.
+
+Plain SQL against the tables as the migrations leave them, so that later changes to the
+models or to RollupService cannot change what an old migration does.
+"""
+
+# First day of the transaction's month
+PERIOD = {
+    "postgresql": "CAST(date_trunc('month', date) AS DATE)",
+    "sqlite": "date(date, 'start of month')",
+}
+
+def _rebuild_statements(ctx, condition: str, params: dict) -> tuple:
+    """Replace the rollups of the users matching condition (on user_id) with fresh totals."""
+    period = PERIOD[ctx.engine.dialect.name]
+    return (
+        (f"DELETE FROM transaction_rollups WHERE {condition}", params),
+        (
+            "INSERT INTO transaction_rollups "
+            "(user_id, wallet_id, category, transaction_type, period, total_amount, transaction_count) "
+            f"SELECT user_id, wallet_id, category, transaction_type, {period}, "
+            "COALESCE(SUM(amount), 0), COUNT(id) "
+            f"FROM transactions WHERE date IS NOT NULL AND {condition} "
+            f"GROUP BY user_id, wallet_id, category, transaction_type, {period}",
+            params
+        ),
+    )
+
+def rebuild_rollups(ctx):
+    """Recompute every user's rollups, one committed batch of user ids at a time."""
+    for low, high in ctx.batches("users"):
+        ctx.transaction(*_rebuild_statements(
+            ctx, "user_id >= :low AND user_id < :high", {"low": low, "high": high}
+        ))
+
+def rebuild_user_rollups(ctx, user_id: int):
+    """Recompute one user's rollups in a single transaction."""
+    ctx.transaction(*_rebuild_statements(ctx, "user_id = :user_id", {"user_id": user_id}))
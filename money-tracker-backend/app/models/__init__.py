@@ -1,5 +1,5 @@
 from .user import User
-from .transaction import Transaction
+from .transaction import Transaction, TransactionRollup
 from .wallet import Wallet, WalletTransfer, BalanceAdjustment
 
-__all__ = ["User", "Transaction", "Wallet", "WalletTransfer", "BalanceAdjustment"]
\ No newline at end of file
+__all__ = ["User", "Transaction", "TransactionRollup", "Wallet", "WalletTransfer", "BalanceAdjustment"]
\ No newline at end of file
@@ -1,15 +1,26 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.core.database import Base
+from app.core.money import Money
 
 class Transaction(Base):
     """Transaction database model."""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Transaction listing (keyset pagination, newest first by (date, id))
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+        # Transaction listing filtered by category
+        Index("ix_transactions_user_category_date_id", "user_id", "category", "date", "id"),
+        # Dashboard recent transactions
+        Index("ix_transactions_user_created_at", "user_id", "created_at"),
+        # Wallet history, wallet analytics windows and per-wallet counts
+        Index("ix_transactions_wallet_date_id", "wallet_id", "date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float)
+    amount = Column(Money)
     category = Column(String)
     description = Column(String)
     transaction_type = Column(String)  # "income" or "expense"
@@ -20,3 +31,28 @@ class Transaction(Base):
     
     owner = relationship("User", back_populates="transactions")
     wallet = relationship("Wallet", back_populates="transactions")
+
+class TransactionRollup(Base):
+    """Per-user/per-month income and expense totals, maintained incrementally from transactions."""
+    __tablename__ = "transaction_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    wallet_id = Column(Integer, ForeignKey("wallets.id"))
+    category = Column(String)
+    transaction_type = Column(String)  # "income" or "expense"
+    period = Column(Date, nullable=False)  # first day of the month
+    total_amount = Column(Money, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+# One row per rollup key. A plain unique constraint treats NULLs as distinct, so transactions
+# without a wallet (or category) would get a row per concurrent insert; the constants are
+# literal so PostgreSQL can match the index to ON CONFLICT with server-side parameters too.
+ROLLUP_KEY = (
+    TransactionRollup.user_id,
+    func.coalesce(TransactionRollup.wallet_id, literal_column("0")),
+    func.coalesce(TransactionRollup.category, literal_column("''")),
+    func.coalesce(TransactionRollup.transaction_type, literal_column("''")),
+    TransactionRollup.period,
+)
+Index("ux_transaction_rollups_key", *ROLLUP_KEY, unique=True)
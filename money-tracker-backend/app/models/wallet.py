@@ -1,19 +1,30 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.core.database import Base
+from app.core.money import Money
 
 class Wallet(Base):
     """Wallet database model."""
     __tablename__ = "wallets"
+    __table_args__ = (
+        # Wallet listing, ordered by default flag and creation time
+        Index("ix_wallets_user_created_at", "user_id", "created_at"),
+        # Default wallet lookup
+        Index(
+            "ix_wallets_user_default_active", "user_id",
+            postgresql_where=text("is_default AND is_active"),
+            sqlite_where=text("is_default AND is_active")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     wallet_type = Column(String, nullable=False)  # cash, bank_account, credit_card, savings, investment
     icon = Column(String, default="wallet")  # icon identifier
     color = Column(String, default="#4F46E5")  # hex color code
-    balance = Column(Float, default=0.0)
+    balance = Column(Money, default=0)
     is_default = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
     description = Column(String)
@@ -40,9 +51,13 @@ class Wallet(Base):
 class WalletTransfer(Base):
     """Wallet transfer database model for tracking money transfers between wallets."""
     __tablename__ = "wallet_transfers"
+    __table_args__ = (
+        # Transfer history, newest first
+        Index("ix_wallet_transfers_user_transfer_date", "user_id", "transfer_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     description = Column(String)
     transfer_date = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -60,12 +75,16 @@ class WalletTransfer(Base):
 class BalanceAdjustment(Base):
     """Balance adjustment model for manual reconciliation."""
     __tablename__ = "balance_adjustments"
+    __table_args__ = (
+        # Adjustment history per wallet, newest first
+        Index("ix_balance_adjustments_wallet_adjusted_at", "wallet_id", "adjusted_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     wallet_id = Column(Integer, ForeignKey("wallets.id"))
-    old_balance = Column(Float, nullable=False)
-    new_balance = Column(Float, nullable=False)
-    adjustment_amount = Column(Float, nullable=False)
+    old_balance = Column(Money, nullable=False)
+    new_balance = Column(Money, nullable=False)
+    adjustment_amount = Column(Money, nullable=False)
     reason = Column(String)
     adjusted_at = Column(DateTime, default=datetime.utcnow)
     user_id = Column(Integer, ForeignKey("users.id"))
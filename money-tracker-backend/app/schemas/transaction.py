@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Optional, List, Union
 
 class TransactionCreate(BaseModel):
     """Schema for transaction creation."""
@@ -34,6 +34,17 @@ class TransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TransactionImportError(BaseModel):
+    """Schema for a row rejected during a bulk import."""
+    row: int
+    error: str
+
+class TransactionImportResult(BaseModel):
+    """Schema for bulk import results."""
+    imported: int
+    failed: int
+    errors: List[TransactionImportError]
+
 class DashboardData(BaseModel):
     """Schema for dashboard data."""
     balance: float
@@ -41,3 +52,23 @@ class DashboardData(BaseModel):
     total_expenses: float
     recent_transactions: List[TransactionResponse]
     monthly_summary: dict
+
+class TimeSeriesPoint(BaseModel):
+    """Schema for one bucket of a time series."""
+    period: date  # first day of the bucket
+    income: float
+    expenses: float
+    net: float
+
+class TimeSeries(BaseModel):
+    """Schema for one series: all data, or one wallet or category when grouped."""
+    key: Optional[Union[int, str]] = None  # wallet id or category; None when not grouped
+    points: List[TimeSeriesPoint]
+
+class TimeSeriesData(BaseModel):
+    """Schema for bucketed income/expense analytics."""
+    interval: str  # "day", "week" or "month"
+    start: date
+    end: date
+    group_by: Optional[str] = None
+    series: List[TimeSeries]
@@ -3,6 +3,8 @@ from datetime import datetime
 from typing import Optional, List
 from enum import Enum
 
+from app.schemas.transaction import TransactionResponse
+
 class WalletType(str, Enum):
     """Enumeration for wallet types."""
     CASH = "cash"
@@ -118,7 +120,8 @@ class WalletAnalytics(BaseModel):
 class WalletHistory(BaseModel):
     """Schema for wallet transaction history."""
     wallet: WalletResponse
-    transactions: List[dict]
-    total_count: int
+    transactions: List[TransactionResponse]
+    total_count: Optional[int] = None  # omitted when include_total is false
     page: int
     limit: int
+    next_cursor: Optional[str] = None
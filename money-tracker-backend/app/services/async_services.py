@@ -0,0 +1,48 @@
+"""
+Async variants of the service classes.
+
+Each method runs the matching sync service method through AsyncSession.run_sync, so the
+business logic lives in one place while database I/O goes through the async driver
+without blocking the event loop.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.transaction_service import TransactionService
+from app.services.wallet_service import WalletService
+
+def _async_variant(method):
+    """Wrap a sync service method taking a Session as its first argument."""
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(method, *args, **kwargs)
+    
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return staticmethod(wrapper)
+
+class AsyncTransactionService:
+    """Async service for transaction-related operations."""
+    
+    create_transaction = _async_variant(TransactionService.create_transaction)
+    get_transactions = _async_variant(TransactionService.get_transactions)
+    get_transaction = _async_variant(TransactionService.get_transaction)
+    update_transaction = _async_variant(TransactionService.update_transaction)
+    delete_transaction = _async_variant(TransactionService.delete_transaction)
+    get_dashboard_data = _async_variant(TransactionService.get_dashboard_data)
+    get_category_spending = _async_variant(TransactionService.get_category_spending)
+    get_time_series = _async_variant(TransactionService.get_time_series)
+
+class AsyncWalletService:
+    """Async service for wallet operations."""
+    
+    create_wallet = _async_variant(WalletService.create_wallet)
+    get_wallets = _async_variant(WalletService.get_wallets)
+    get_wallets_summary = _async_variant(WalletService.get_wallets_summary)
+    get_wallet = _async_variant(WalletService.get_wallet)
+    update_wallet = _async_variant(WalletService.update_wallet)
+    delete_wallet = _async_variant(WalletService.delete_wallet)
+    transfer_money = _async_variant(WalletService.transfer_money)
+    adjust_balance = _async_variant(WalletService.adjust_balance)
+    get_wallet_analytics = _async_variant(WalletService.get_wallet_analytics)
+    get_wallet_history = _async_variant(WalletService.get_wallet_history)
+    get_default_wallet = _async_variant(WalletService.get_default_wallet)
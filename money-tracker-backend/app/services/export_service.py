@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+from sqlalchemy import select
+from fastapi import HTTPException
+from typing import Iterator, List, Optional
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.core.money import money_as_float
+from app.models.transaction import Transaction
+
+CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    "id", "date", "amount", "category", "description",
+    "transaction_type", "wallet_id", "created_at"
+]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+class _ChunkSink:
+    """Write-only file object that hands out what was written since the last take()."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+class ExportService:
+    """Service for streaming a user's transaction history out of the database."""
+
+    @staticmethod
+    def check_format(file_format: str):
+        """Reject unknown formats and formats whose optional dependency is missing."""
+        if file_format not in EXPORT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported export format, use one of {', '.join(EXPORT_MEDIA_TYPES)}"
+            )
+        if file_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise HTTPException(status_code=400, detail="Parquet export requires pyarrow to be installed")
+
+    @staticmethod
+    def iter_chunks(
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        wallet_id: Optional[int] = None
+    ) -> Iterator[List[tuple]]:
+        """Yield lists of transaction rows read through a server-side cursor.
+
+        Uses its own session so the rows can be streamed after the request handler returns.
+        """
+        columns = [getattr(Transaction, name) for name in EXPORT_COLUMNS]
+        # Amounts are exported as plain numbers, as they were before money became Numeric
+        columns[EXPORT_COLUMNS.index("amount")] = money_as_float(Transaction.amount).label("amount")
+        statement = select(*columns).where(Transaction.user_id == user_id)
+        if start:
+            statement = statement.where(Transaction.date >= start)
+        if end:
+            statement = statement.where(Transaction.date < end)
+        if wallet_id:
+            statement = statement.where(Transaction.wallet_id == wallet_id)
+        statement = statement.order_by(Transaction.date, Transaction.id)
+
+        db = SessionLocal()
+        try:
+            result = db.execute(statement.execution_options(yield_per=CHUNK_SIZE))
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        finally:
+            db.close()
+
+    @staticmethod
+    def stream_csv(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+        """Serialize row chunks as CSV with a header line."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in chunk
+            )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def stream_ndjson(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+        """Serialize row chunks as newline-delimited JSON objects."""
+        for chunk in chunks:
+            lines = [
+                json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=ExportService._json_default)
+                for row in chunk
+            ]
+            yield ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    def stream_parquet(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+        """Serialize row chunks as a Parquet file, one row group per chunk."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("date", pa.timestamp("us")),
+            ("amount", pa.float64()),
+            ("category", pa.string()),
+            ("description", pa.string()),
+            ("transaction_type", pa.string()),
+            ("wallet_id", pa.int64()),
+            ("created_at", pa.timestamp("us")),
+        ])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+        try:
+            for chunk in chunks:
+                columns = dict(zip(EXPORT_COLUMNS, zip(*chunk)))
+                columns["amount"] = [float(value) if value is not None else None for value in columns["amount"]]
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                yield sink.take()
+        finally:
+            writer.close()
+        yield sink.take()
+
+    @staticmethod
+    def _json_default(value):
+        """Encode values the json module does not handle natively."""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return float(value)
+
+    @staticmethod
+    def stream(
+        file_format: str,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        wallet_id: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Return a byte stream of the user's transactions in the requested format."""
+        chunks = ExportService.iter_chunks(user_id, start, end, wallet_id)
+        if file_format == "csv":
+            return ExportService.stream_csv(chunks)
+        if file_format == "ndjson":
+            return ExportService.stream_ndjson(chunks)
+        return ExportService.stream_parquet(chunks)
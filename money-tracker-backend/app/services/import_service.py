@@ -0,0 +1,236 @@
+import codecs
+import csv
+import re
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from fastapi import HTTPException
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.transaction import Transaction
+from app.models.wallet import Wallet
+from app.models.user import User
+from app.services.wallet_service import WalletService
+from app.services.rollup_service import RollupService
+from app.core.money import to_money
+from app.core.response_cache import mark_user_changed
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+TRANSACTION_TYPES = ("income", "expense")
+# Key under which a CSV row's values beyond the header's columns are collected
+EXTRA_FIELDS = "_extra"
+
+OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)", re.IGNORECASE)
+
+class ImportRowError(ValueError):
+    """A single import row could not be turned into a transaction."""
+
+class ImportService:
+    """Service for bulk importing transactions from bank statement files."""
+    
+    @staticmethod
+    def parse_csv(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+        """Yield (row_number, fields) for each CSV data row, reading the file line by line.
+        
+        Expected header: date, amount, category, description, transaction_type[, wallet_id]
+        """
+        reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"), restkey=EXTRA_FIELDS)
+        for row in reader:
+            extra = row.pop(EXTRA_FIELDS, None)
+            fields = {
+                (key or "").strip().lower(): (value or "").strip()
+                for key, value in row.items()
+            }
+            # Trailing empty cells (a spreadsheet's stray commas) are harmless
+            if extra and any(value.strip() for value in extra):
+                fields[EXTRA_FIELDS] = extra
+            # Row numbers are 1-based and count the header line
+            yield reader.line_num, fields
+    
+    @staticmethod
+    def parse_ofx(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+        """Yield (transaction_number, fields) for each <STMTTRN> block of an OFX statement."""
+        current = None
+        number = 0
+        for line in codecs.iterdecode(stream, "utf-8-sig", errors="replace"):
+            for closing, tag, value in OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if closing and current is not None:
+                        yield number, ImportService._ofx_fields(current)
+                        current = None
+                    elif not closing:
+                        number += 1
+                        current = {}
+                elif current is not None and not closing:
+                    current[tag] = value.strip()
+    
+    @staticmethod
+    def _ofx_fields(block: dict) -> dict:
+        """Map an OFX transaction block onto the CSV field names."""
+        amount = block.get("TRNAMT", "")
+        is_debit = amount.startswith("-")
+        return {
+            "date": block.get("DTPOSTED", ""),
+            "amount": amount.lstrip("+-"),
+            "category": "Other",
+            "description": block.get("NAME") or block.get("MEMO") or "",
+            "transaction_type": "expense" if is_debit else "income",
+        }
+    
+    @staticmethod
+    def _parse_date(value: str) -> datetime:
+        """Parse ISO 8601 dates and OFX YYYYMMDD[HHMMSS][.XXX][TZ] timestamps."""
+        if not value:
+            raise ImportRowError("date is required")
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        digits = re.match(r"\d{8}(\d{6})?", value)
+        if digits:
+            text = digits.group(0)
+            try:
+                return datetime.strptime(text, "%Y%m%d%H%M%S" if len(text) == 14 else "%Y%m%d")
+            except ValueError:
+                pass
+        raise ImportRowError(f"invalid date: {value!r}")
+    
+    @staticmethod
+    def _build_row(
+        fields: dict,
+        user: User,
+        wallet_ids: set,
+        default_wallet_id: Optional[int]
+    ) -> dict:
+        """Validate parsed fields and return the values for a transactions row."""
+        if EXTRA_FIELDS in fields:
+            raise ImportRowError("too many fields")
+        try:
+            amount = to_money(fields.get("amount", ""))
+        except ValueError as e:
+            # to_money says whether the amount is malformed or too large for the column
+            raise ImportRowError(str(e))
+        if amount <= 0:
+            raise ImportRowError("amount must be greater than 0")
+        
+        transaction_type = fields.get("transaction_type", "").lower()
+        if transaction_type not in TRANSACTION_TYPES:
+            raise ImportRowError(f"transaction_type must be one of {', '.join(TRANSACTION_TYPES)}")
+        
+        category = fields.get("category")
+        if not category:
+            raise ImportRowError("category is required")
+        
+        wallet_id = default_wallet_id
+        if fields.get("wallet_id"):
+            try:
+                wallet_id = int(fields["wallet_id"])
+            except ValueError:
+                raise ImportRowError(f"invalid wallet_id: {fields['wallet_id']!r}")
+            if wallet_id not in wallet_ids:
+                raise ImportRowError(f"wallet {wallet_id} not found")
+        
+        return {
+            "amount": amount,
+            "category": category,
+            "description": fields.get("description", ""),
+            "transaction_type": transaction_type,
+            "date": ImportService._parse_date(fields.get("date", "")),
+            "created_at": datetime.utcnow(),
+            "wallet_id": wallet_id,
+            "user_id": user.id
+        }
+    
+    @staticmethod
+    def import_transactions(
+        db: Session,
+        stream: BinaryIO,
+        file_format: str,
+        user: User,
+        wallet_id: Optional[int] = None
+    ) -> dict:
+        """Import transactions from a CSV or OFX stream.
+        
+        Rows are validated one by one and inserted in batches. Invalid rows are reported
+        and skipped; the valid ones are committed together with a single balance update
+        per wallet and the matching rollup deltas.
+        """
+        if file_format == "csv":
+            rows = ImportService.parse_csv(stream)
+        elif file_format == "ofx":
+            rows = ImportService.parse_ofx(stream)
+        else:
+            raise HTTPException(status_code=400, detail="Unsupported import format, use csv or ofx")
+        
+        wallet_ids = {
+            row.id for row in db.query(Wallet.id).filter(
+                Wallet.user_id == user.id, Wallet.is_active == True
+            )
+        }
+        if wallet_id is not None:
+            if wallet_id not in wallet_ids:
+                raise HTTPException(status_code=404, detail="Wallet not found")
+            default_wallet_id = wallet_id
+        else:
+            default_wallet = WalletService.get_default_wallet(db, user)
+            default_wallet_id = default_wallet.id if default_wallet else None
+        
+        imported = 0
+        failed = 0
+        errors: List[dict] = []
+        batch: List[dict] = []
+        balance_deltas: Dict[int, Decimal] = {}
+        rollup_deltas: Dict[tuple, list] = {}
+        
+        def flush_batch():
+            if batch:
+                db.execute(insert(Transaction), batch)
+                batch.clear()
+        
+        try:
+            for row_number, fields in rows:
+                try:
+                    values = ImportService._build_row(fields, user, wallet_ids, default_wallet_id)
+                except ImportRowError as e:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"row": row_number, "error": str(e)})
+                    continue
+                
+                batch.append(values)
+                imported += 1
+                
+                signed_amount = values["amount"] if values["transaction_type"] == "income" else -values["amount"]
+                if values["wallet_id"]:
+                    balance_deltas[values["wallet_id"]] = balance_deltas.get(values["wallet_id"], Decimal(0)) + signed_amount
+                key = (
+                    values["wallet_id"], values["category"], values["transaction_type"],
+                    RollupService.month_start(values["date"])
+                )
+                totals = rollup_deltas.setdefault(key, [Decimal(0), 0])
+                totals[0] += values["amount"]
+                totals[1] += 1
+                
+                if len(batch) >= BATCH_SIZE:
+                    flush_batch()
+            flush_batch()
+            
+            for target_wallet_id, delta in balance_deltas.items():
+                WalletService.apply_balance_delta(db, target_wallet_id, delta)
+            for (target_wallet_id, category, transaction_type, period), (amount, count) in rollup_deltas.items():
+                RollupService.apply_delta(
+                    db, user.id, target_wallet_id, category, transaction_type, period, amount, count
+                )
+            mark_user_changed(db, user.id)
+            db.commit()
+        except UnicodeDecodeError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+        except csv.Error as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+        
+        return {"imported": imported, "failed": failed, "errors": errors}
@@ -0,0 +1,116 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, extract
+from typing import Optional
+from datetime import date, datetime
+
+from app.models.transaction import ROLLUP_KEY, Transaction, TransactionRollup
+from app.core.dialect import dialect_insert
+from app.core.money import to_money
+
+class RollupService:
+    """Service for maintaining the monthly transaction rollup table."""
+    
+    @staticmethod
+    def month_start(value: datetime) -> date:
+        """Return the rollup period (first day of the month) for a date."""
+        return date(value.year, value.month, 1)
+    
+    @staticmethod
+    def apply_delta(
+        db: Session,
+        user_id: int,
+        wallet_id: Optional[int],
+        category: str,
+        transaction_type: str,
+        transaction_date: datetime,
+        amount: float,
+        count: int
+    ):
+        """Add an amount/count delta to a rollup row, creating the row if needed.
+        
+        A single upsert, so concurrent first writes to the same key add up instead of
+        failing on the unique index. Does not commit; the caller commits together with
+        the transaction change.
+        """
+        if transaction_date is None:
+            return
+        
+        amount = to_money(amount)
+        statement = dialect_insert(db, TransactionRollup).values(
+            user_id=user_id,
+            wallet_id=wallet_id,
+            category=category,
+            transaction_type=transaction_type,
+            period=RollupService.month_start(transaction_date),
+            total_amount=amount,
+            transaction_count=count
+        )
+        db.execute(statement.on_conflict_do_update(
+            index_elements=ROLLUP_KEY,
+            set_={
+                "total_amount": TransactionRollup.total_amount + statement.excluded.total_amount,
+                "transaction_count": TransactionRollup.transaction_count + statement.excluded.transaction_count
+            }
+        ))
+    
+    @staticmethod
+    def add_transaction(db: Session, transaction: Transaction):
+        """Account for a newly created transaction."""
+        RollupService.apply_delta(
+            db, transaction.user_id, transaction.wallet_id, transaction.category,
+            transaction.transaction_type, transaction.date, transaction.amount, 1
+        )
+    
+    @staticmethod
+    def remove_transaction(db: Session, transaction: Transaction):
+        """Account for a deleted transaction."""
+        RollupService.apply_delta(
+            db, transaction.user_id, transaction.wallet_id, transaction.category,
+            transaction.transaction_type, transaction.date, -transaction.amount, -1
+        )
+    
+    @staticmethod
+    def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+        """Recompute rollups from the raw transactions, for one user or for everyone.
+        
+        Returns the number of rollup rows written. Does not commit.
+        """
+        delete_query = db.query(TransactionRollup)
+        if user_id is not None:
+            delete_query = delete_query.filter(TransactionRollup.user_id == user_id)
+        delete_query.delete(synchronize_session=False)
+        
+        year = extract("year", Transaction.date)
+        month = extract("month", Transaction.date)
+        query = db.query(
+            Transaction.user_id,
+            Transaction.wallet_id,
+            Transaction.category,
+            Transaction.transaction_type,
+            year.label("year"),
+            month.label("month"),
+            func.sum(Transaction.amount).label("total_amount"),
+            func.count(Transaction.id).label("transaction_count")
+        ).filter(Transaction.date.isnot(None))
+        if user_id is not None:
+            query = query.filter(Transaction.user_id == user_id)
+        query = query.group_by(
+            Transaction.user_id, Transaction.wallet_id, Transaction.category,
+            Transaction.transaction_type, year, month
+        )
+        
+        rows = [
+            {
+                "user_id": row.user_id,
+                "wallet_id": row.wallet_id,
+                "category": row.category,
+                "transaction_type": row.transaction_type,
+                "period": date(int(row.year), int(row.month), 1),
+                "total_amount": row.total_amount,
+                "transaction_count": row.transaction_count
+            }
+            for row in query
+        ]
+        if rows:
+            db.bulk_insert_mappings(TransactionRollup, rows)
+        return len(rows)
@@ -1,12 +1,24 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, case, tuple_, select, union_all
 from fastapi import HTTPException
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
-from app.models.transaction import Transaction
+from app.models.transaction import Transaction, TransactionRollup
 from app.models.user import User
-from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
 from app.services.wallet_service import WalletService
+from app.services.rollup_service import RollupService
+from app.core.dialect import lock_for_update
+from app.core.pagination import decode_cursor
+from app.core.money import to_money, plain_number
+from app.core.response_cache import mark_user_changed
+from app.core.serialization import response_columns
+from app.core.timeseries import bucket_expression, bucket_starts, next_bucket
+
+# Default range of a time series ending today, and the most buckets one may span
+TIME_SERIES_DEFAULT_SPAN = {"day": timedelta(days=29), "week": timedelta(weeks=11), "month": timedelta(days=334)}
+TIME_SERIES_MAX_BUCKETS = 1000
 
 class TransactionService:
     """Service for transaction-related operations."""
@@ -22,7 +34,7 @@ class TransactionService:
                 wallet_id = default_wallet.id
         
         db_transaction = Transaction(
-            amount=transaction.amount,
+            amount=to_money(transaction.amount),
             category=transaction.category,
             description=transaction.description,
             transaction_type=transaction.transaction_type,
@@ -32,14 +44,16 @@ class TransactionService:
         )
         
         db.add(db_transaction)
-        db.commit()
+        RollupService.add_transaction(db, db_transaction)
         
-        # Update wallet balance
+        # Update wallet balance in the same database transaction as the insert
         if wallet_id:
             WalletService.update_wallet_balance(
-                db, wallet_id, transaction.amount, transaction.transaction_type
+                db, wallet_id, db_transaction.amount, transaction.transaction_type
             )
         
+        mark_user_changed(db, user.id)
+        db.commit()
         db.refresh(db_transaction)
         return db_transaction
     
@@ -49,12 +63,26 @@ class TransactionService:
         user: User, 
         skip: int = 0, 
         limit: int = 100, 
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        as_rows: bool = False
     ) -> List[Transaction]:
-        """Get user's transactions with optional filtering."""
-        query = db.query(Transaction).filter(Transaction.user_id == user.id)
+        """Get user's transactions with optional filtering, newest first.
+        
+        When a cursor is given the page starts right after it (keyset pagination)
+        and skip is ignored. With as_rows=True, returns rows holding only the
+        TransactionResponse columns instead of ORM instances.
+        """
+        entities = response_columns(Transaction, TransactionResponse) if as_rows else [Transaction]
+        query = db.query(*entities).filter(Transaction.user_id == user.id)
         if category:
             query = query.filter(Transaction.category == category)
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            return query.filter(
+                tuple_(Transaction.date, Transaction.id) < tuple_(cursor_date, cursor_id)
+            ).limit(limit).all()
         return query.offset(skip).limit(limit).all()
     
     @staticmethod
@@ -68,6 +96,25 @@ class TransactionService:
             raise HTTPException(status_code=404, detail="Transaction not found")
         return transaction
     
+    @staticmethod
+    def _lock_transaction(db: Session, transaction_id: int, user: User, wallet_ids: List[Optional[int]]) -> Transaction:
+        """Lock a transaction and the wallets it moves between until commit.
+        
+        The row is read again after the lock is granted, so a transaction deleted by a
+        concurrent request is a 404 rather than a second balance reversal. Wallets are
+        locked after it, in the id order lock_wallets uses.
+        """
+        transaction = lock_for_update(db, db.query(Transaction).filter(
+            Transaction.id == transaction_id,
+            Transaction.user_id == user.id
+        )).populate_existing().first()
+        if not transaction:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+        wallet_ids = {transaction.wallet_id, *wallet_ids} - {None}
+        if wallet_ids:
+            WalletService.lock_wallets(db, sorted(wallet_ids), user)
+        return transaction
+    
     @staticmethod
     def update_transaction(
         db: Session, 
@@ -76,18 +123,40 @@ class TransactionService:
         user: User
     ) -> Transaction:
         """Update a transaction."""
-        transaction = TransactionService.get_transaction(db, transaction_id, user)
+        transaction = TransactionService._lock_transaction(
+            db, transaction_id, user, [transaction_update.wallet_id]
+        )
         
         # Store old values for wallet balance adjustment
         old_amount = transaction.amount
         old_type = transaction.transaction_type
         old_wallet_id = transaction.wallet_id
+        old_category = transaction.category
+        old_date = transaction.date
         
         # Update transaction fields
-        for field, value in transaction_update.dict(exclude_unset=True).items():
+        update_data = transaction_update.dict(exclude_unset=True)
+        if update_data.get("amount") is not None:
+            update_data["amount"] = to_money(update_data["amount"])
+        for field, value in update_data.items():
             setattr(transaction, field, value)
         
-        db.commit()
+        # Move the transaction between rollup buckets (or adjust in place)
+        old_key = (old_wallet_id, old_category, old_type, old_date and RollupService.month_start(old_date))
+        new_key = (
+            transaction.wallet_id, transaction.category, transaction.transaction_type,
+            transaction.date and RollupService.month_start(transaction.date)
+        )
+        if old_key == new_key:
+            RollupService.apply_delta(
+                db, user.id, old_wallet_id, old_category, old_type, old_date,
+                transaction.amount - old_amount, 0
+            )
+        else:
+            RollupService.apply_delta(
+                db, user.id, old_wallet_id, old_category, old_type, old_date, -old_amount, -1
+            )
+            RollupService.add_transaction(db, transaction)
         
         # Update wallet balances
         if old_wallet_id:
@@ -103,13 +172,15 @@ class TransactionService:
                 db, new_wallet_id, transaction.amount, transaction.transaction_type
             )
         
+        mark_user_changed(db, user.id)
+        db.commit()
         db.refresh(transaction)
         return transaction
     
     @staticmethod
     def delete_transaction(db: Session, transaction_id: int, user: User) -> dict:
         """Delete a transaction."""
-        transaction = TransactionService.get_transaction(db, transaction_id, user)
+        transaction = TransactionService._lock_transaction(db, transaction_id, user, [])
         
         # Update wallet balance (reverse the transaction)
         if transaction.wallet_id:
@@ -118,60 +189,238 @@ class TransactionService:
                 db, transaction.wallet_id, transaction.amount, reverse_type
             )
         
+        RollupService.remove_transaction(db, transaction)
         db.delete(transaction)
+        mark_user_changed(db, user.id)
         db.commit()
         return {"message": "Transaction deleted successfully"}
     
     @staticmethod
     def get_dashboard_data(db: Session, user: User) -> dict:
         """Get dashboard data for user."""
-        transactions = db.query(Transaction).filter(Transaction.user_id == user.id).all()
+        current_period = RollupService.month_start(datetime.now())
+        
+        is_income = TransactionRollup.transaction_type == "income"
+        is_expense = TransactionRollup.transaction_type == "expense"
+        in_month = TransactionRollup.period == current_period
         
-        total_income = sum(t.amount for t in transactions if t.transaction_type == "income")
-        total_expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
+        # Lifetime and monthly totals in a single aggregate over the monthly rollups
+        totals = db.query(
+            func.sum(case((is_income, TransactionRollup.total_amount))).label("total_income"),
+            func.sum(case((is_expense, TransactionRollup.total_amount))).label("total_expenses"),
+            func.sum(case((and_(is_income, in_month), TransactionRollup.total_amount))).label("monthly_income"),
+            func.sum(case((and_(is_expense, in_month), TransactionRollup.total_amount))).label("monthly_expenses"),
+        ).filter(TransactionRollup.user_id == user.id).one()
+        
+        # SUM over no rows is NULL; keep the previous behaviour of reporting 0
+        total_income = totals.total_income if totals.total_income is not None else 0
+        total_expenses = totals.total_expenses if totals.total_expenses is not None else 0
+        monthly_income = totals.monthly_income if totals.monthly_income is not None else 0
+        monthly_expenses = totals.monthly_expenses if totals.monthly_expenses is not None else 0
         balance = total_income - total_expenses
         
         recent_transactions = db.query(Transaction).filter(
             Transaction.user_id == user.id
         ).order_by(Transaction.created_at.desc()).limit(5).all()
         
-        # Monthly summary
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-        monthly_transactions = [
-            t for t in transactions 
-            if t.date.month == current_month and t.date.year == current_year
-        ]
-        
-        monthly_income = sum(t.amount for t in monthly_transactions if t.transaction_type == "income")
-        monthly_expenses = sum(t.amount for t in monthly_transactions if t.transaction_type == "expense")
-        
         return {
-            "balance": balance,
-            "total_income": total_income,
-            "total_expenses": total_expenses,
+            "balance": plain_number(balance),
+            "total_income": plain_number(total_income),
+            "total_expenses": plain_number(total_expenses),
             "recent_transactions": recent_transactions,
             "monthly_summary": {
-                "income": monthly_income,
-                "expenses": monthly_expenses,
-                "net": monthly_income - monthly_expenses
+                "income": plain_number(monthly_income),
+                "expenses": plain_number(monthly_expenses),
+                "net": plain_number(monthly_income - monthly_expenses)
             }
         }
     
     @staticmethod
-    def get_category_spending(db: Session, user: User) -> dict:
-        """Get category spending analysis."""
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
-            Transaction.transaction_type == "expense"
+    def get_category_spending(
+        db: Session,
+        user: User,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        wallet_id: Optional[int] = None,
+        top: Optional[int] = None
+    ) -> dict:
+        """Get expense totals and percent of total per category, largest first.
+        
+        start and end are inclusive days. Whole months in the range are read from the
+        rollups and only partial months at either edge from the transactions. With top,
+        categories after the first top are folded into "Other".
+        """
+        if start and end and start > end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        
+        combined = union_all(*TransactionService._expense_parts(user, start, end, wallet_id)).subquery()
+        category_total = func.sum(combined.c.amount)
+        ranked = select(
+            combined.c.category,
+            category_total.label("total"),
+            func.sum(category_total).over().label("grand_total"),
+            func.row_number().over(order_by=(category_total.desc(), combined.c.category)).label("rank")
+        ).group_by(combined.c.category).subquery()
+        
+        label = ranked.c.category if top is None else case((ranked.c.rank <= top, ranked.c.category), else_="Other")
+        total = func.sum(ranked.c.total)
+        rows = db.execute(
+            select(
+                label.label("category"),
+                total.label("total"),
+                # NULL (reported as 0) rather than a division error when everything sums to 0
+                (total * 100 / func.nullif(func.max(ranked.c.grand_total), 0)).label("percent")
+            ).group_by(label).order_by(func.min(ranked.c.rank))
         ).all()
         
-        category_spending = {}
-        for transaction in transactions:
-            category = transaction.category
-            if category in category_spending:
-                category_spending[category] += transaction.amount
-            else:
-                category_spending[category] = transaction.amount
+        categories = [
+            {"category": row.category, "total": plain_number(row.total), "percent": round(float(row.percent or 0), 2)}
+            for row in rows
+        ]
+        return {
+            "data": {item["category"]: item["total"] for item in categories},
+            "categories": categories,
+            "total": plain_number(sum(row.total for row in rows))
+        }
+    
+    @staticmethod
+    def _expense_parts(user: User, start: Optional[date], end: Optional[date], wallet_id: Optional[int]) -> list:
+        """Selects of (category, amount) that together cover the expenses in [start, end]."""
+        lower = start
+        upper = end + timedelta(days=1) if end else None  # exclusive
+        # Whole months: from the first month starting on or after lower to the month holding upper
+        first_month = None if lower is None else lower if lower.day == 1 else next_bucket("month", lower)
+        end_month = None if upper is None else upper.replace(day=1)
+        
+        def from_transactions(range_start: Optional[date], range_end: Optional[date]):
+            filters = [Transaction.user_id == user.id, Transaction.transaction_type == "expense"]
+            if wallet_id is not None:
+                filters.append(Transaction.wallet_id == wallet_id)
+            if range_start is not None:
+                filters.append(Transaction.date >= datetime.combine(range_start, datetime.min.time()))
+            if range_end is not None:
+                filters.append(Transaction.date < datetime.combine(range_end, datetime.min.time()))
+            return select(
+                Transaction.category, func.sum(Transaction.amount).label("amount")
+            ).where(*filters).group_by(Transaction.category)
+        
+        if first_month and end_month and first_month >= end_month:
+            # No whole month in the range
+            return [from_transactions(lower, upper)]
+        
+        filters = [
+            TransactionRollup.user_id == user.id,
+            TransactionRollup.transaction_type == "expense",
+            TransactionRollup.transaction_count > 0
+        ]
+        if wallet_id is not None:
+            filters.append(TransactionRollup.wallet_id == wallet_id)
+        if first_month is not None:
+            filters.append(TransactionRollup.period >= first_month)
+        if end_month is not None:
+            filters.append(TransactionRollup.period < end_month)
+        parts = [select(TransactionRollup.category, TransactionRollup.total_amount.label("amount")).where(*filters)]
+        if lower is not None and lower < first_month:
+            parts.append(from_transactions(lower, first_month))
+        if upper is not None and end_month < upper:
+            parts.append(from_transactions(end_month, upper))
+        return parts
+    
+    @staticmethod
+    def get_time_series(
+        db: Session,
+        user: User,
+        interval: str = "month",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        wallet_id: Optional[int] = None,
+        category: Optional[str] = None,
+        group_by: Optional[str] = None
+    ) -> dict:
+        """Get income, expenses and net per day, week or month, with empty buckets as zeros.
+        
+        Monthly series are read from the rollups, except for a last month that ends before
+        its final day; daily and weekly ones are grouped in SQL over the transactions. Weeks
+        start on Monday and the range starts on a bucket boundary; nothing after end counts.
+        With group_by="wallet" or "category" there is one series per wallet or category.
+        """
+        end = end or datetime.utcnow().date()
+        start = start or end - TIME_SERIES_DEFAULT_SPAN[interval]
+        if start > end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        periods = bucket_starts(interval, start, end)
+        if len(periods) > TIME_SERIES_MAX_BUCKETS:
+            raise HTTPException(
+                status_code=400, detail=f"Range spans more than {TIME_SERIES_MAX_BUCKETS} {interval} buckets"
+            )
+        
+        dialect_name = db.get_bind().dialect.name
+        end_exclusive = datetime.combine(end + timedelta(days=1), datetime.min.time())
+        # (table, bucket of a row, amount, range filter) to read from
+        sources = []
+        if interval == "month":
+            # Whole months come from the rollups; a last month cut short by end from the
+            # transactions, so nothing after end is counted
+            last_month = periods[-1]
+            partial = end + timedelta(days=1) < next_bucket("month", last_month)
+            rollups_end = last_month if partial else next_bucket("month", last_month)
+            sources.append((
+                TransactionRollup, TransactionRollup.period, TransactionRollup.total_amount,
+                and_(TransactionRollup.period >= periods[0], TransactionRollup.period < rollups_end)
+            ))
+            if partial:
+                sources.append((
+                    Transaction, bucket_expression(dialect_name, interval, Transaction.date), Transaction.amount,
+                    and_(
+                        Transaction.date >= datetime.combine(last_month, datetime.min.time()),
+                        Transaction.date < end_exclusive
+                    )
+                ))
+        else:
+            sources.append((
+                Transaction, bucket_expression(dialect_name, interval, Transaction.date), Transaction.amount,
+                and_(
+                    Transaction.date >= datetime.combine(periods[0], datetime.min.time()),
+                    Transaction.date < end_exclusive
+                )
+            ))
+        
+        totals = {}
+        for source, period, amount, in_range in sources:
+            group_columns = {"wallet": source.wallet_id, "category": source.category}
+            key = group_columns[group_by] if group_by else None
+            filters = [source.user_id == user.id, in_range]
+            if wallet_id is not None:
+                filters.append(source.wallet_id == wallet_id)
+            if category is not None:
+                filters.append(source.category == category)
+            
+            query = db.query(
+                period.label("period"),
+                *([key.label("key")] if key is not None else []),
+                func.sum(case((source.transaction_type == "income", amount))).label("income"),
+                func.sum(case((source.transaction_type == "expense", amount))).label("expenses")
+            ).filter(*filters).group_by(period, *([key] if key is not None else []))
+            
+            for row in query.all():
+                buckets = totals.setdefault(row.key if key is not None else None, {})
+                income, expenses = buckets.get(row.period, (0, 0))
+                buckets[row.period] = (income + (row.income or 0), expenses + (row.expenses or 0))
+        if not group_by:
+            totals.setdefault(None, {})
+        
+        series = []
+        # Wallet ids in numeric order, categories alphabetically, and no wallet/category last
+        for series_key in sorted(totals, key=lambda value: (value is None, value if value is not None else 0)):
+            points = []
+            for bucket in periods:
+                income, expenses = totals[series_key].get(bucket, (0, 0))
+                points.append({
+                    "period": bucket,
+                    "income": plain_number(income),
+                    "expenses": plain_number(expenses),
+                    "net": plain_number(income - expenses)
+                })
+            series.append({"key": series_key, "points": points})
         
-        return {"data": category_spending}
+        return {"interval": interval, "start": periods[0], "end": end, "group_by": group_by, "series": series}
@@ -11,6 +11,10 @@ class UserService:
     @staticmethod
     def create_user(db: Session, user: UserCreate) -> User:
         """Create a new user."""
+        # Hash before touching the database so no pooled connection is held while
+        # waiting on the password pool
+        hashed_password = get_password_hash(user.password)
+        
         # Check if user exists
         db_user = db.query(User).filter(
             (User.username == user.username) | (User.email == user.email)
@@ -22,7 +26,6 @@ class UserService:
             )
         
         # Create new user
-        hashed_password = get_password_hash(user.password)
         db_user = User(
             username=user.username,
             email=user.email,
@@ -37,7 +40,15 @@ class UserService:
     def authenticate_user(db: Session, username: str, password: str) -> User:
         """Authenticate user with username and password."""
         user = db.query(User).filter(User.username == username).first()
-        if not user or not verify_password(password, user.hashed_password):
+        if not user:
+            return None
+        
+        # Release the connection before the slow bcrypt check; the detached user keeps
+        # its loaded attributes
+        db.expunge(user)
+        db.rollback()
+        
+        if not verify_password(password, user.hashed_password):
             return None
         return user
     
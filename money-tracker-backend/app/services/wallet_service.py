@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, and_, or_, tuple_, case
 from typing import List, Optional
 from datetime import datetime, timedelta
 
@@ -8,10 +9,17 @@ from app.models.transaction import Transaction
 from app.models.user import User
 from app.schemas.wallet import (
     WalletCreate, WalletUpdate, WalletTransferCreate, BalanceAdjustmentCreate,
-    WalletAnalytics
+    WalletAnalytics, WalletSummary, WalletResponse, WalletTransferResponse
 )
+from app.schemas.transaction import TransactionResponse
 from fastapi import HTTPException
 
+from app.core.pagination import decode_cursor, next_cursor
+from app.core.dialect import lock_for_update
+from app.core.money import to_money
+from app.core.response_cache import mark_user_changed
+from app.core.serialization import response_columns
+
 class WalletService:
     """Service class for wallet operations."""
     
@@ -36,13 +44,14 @@ class WalletService:
             wallet_type=wallet_data.wallet_type.value,
             icon=wallet_data.icon,
             color=wallet_data.color,
-            balance=wallet_data.initial_balance or 0.0,
+            balance=to_money(wallet_data.initial_balance or 0),
             description=wallet_data.description,
             is_default=is_default,
             user_id=user.id
         )
         
         db.add(wallet)
+        mark_user_changed(db, user.id)
         db.commit()
         db.refresh(wallet)
         return wallet
@@ -57,6 +66,38 @@ class WalletService:
         
         return query.order_by(Wallet.is_default.desc(), Wallet.created_at.desc()).all()
     
+    @staticmethod
+    def get_wallets_summary(db: Session, user: User) -> List[WalletSummary]:
+        """Get active wallets with their transaction counts in a single query."""
+        transaction_counts = db.query(
+            Transaction.wallet_id,
+            func.count(Transaction.id).label("transaction_count")
+        ).filter(Transaction.user_id == user.id).group_by(Transaction.wallet_id).subquery()
+        
+        rows = db.query(
+            Wallet,
+            func.coalesce(transaction_counts.c.transaction_count, 0)
+        ).outerjoin(
+            transaction_counts, transaction_counts.c.wallet_id == Wallet.id
+        ).filter(
+            and_(Wallet.user_id == user.id, Wallet.is_active == True)
+        ).order_by(Wallet.is_default.desc(), Wallet.created_at.desc()).all()
+        
+        return [
+            WalletSummary(
+                id=wallet.id,
+                name=wallet.name,
+                wallet_type=wallet.wallet_type,
+                icon=wallet.icon,
+                color=wallet.color,
+                balance=wallet.balance,
+                is_default=wallet.is_default,
+                is_active=wallet.is_active,
+                transaction_count=transaction_count
+            )
+            for wallet, transaction_count in rows
+        ]
+    
     @staticmethod
     def get_wallet(db: Session, wallet_id: int, user: User) -> Wallet:
         """Get a specific wallet."""
@@ -90,6 +131,7 @@ class WalletService:
         
         wallet.updated_at = datetime.utcnow()
         
+        mark_user_changed(db, user.id)
         db.commit()
         db.refresh(wallet)
         return wallet
@@ -117,68 +159,98 @@ class WalletService:
             if other_wallet:
                 other_wallet.is_default = True
         
+        mark_user_changed(db, user.id)
         db.commit()
         return True
     
+    @staticmethod
+    def lock_wallets(db: Session, wallet_ids: List[int], user: User) -> dict:
+        """Lock the user's wallets FOR UPDATE in id order and return them by id."""
+        # A fixed lock order keeps two opposite transfers from deadlocking each other
+        wallets = lock_for_update(db, db.query(Wallet).filter(
+            and_(Wallet.id.in_(wallet_ids), Wallet.user_id == user.id)
+        ).order_by(Wallet.id)).populate_existing().all()
+        
+        locked = {wallet.id: wallet for wallet in wallets}
+        if any(wallet_id not in locked for wallet_id in wallet_ids):
+            raise HTTPException(status_code=404, detail="Wallet not found")
+        return locked
+    
     @staticmethod
     def transfer_money(db: Session, transfer_data: WalletTransferCreate, user: User) -> WalletTransfer:
         """Transfer money between wallets."""
-        # Validate wallets
-        from_wallet = WalletService.get_wallet(db, transfer_data.from_wallet_id, user)
-        to_wallet = WalletService.get_wallet(db, transfer_data.to_wallet_id, user)
-        
-        if from_wallet.id == to_wallet.id:
+        if transfer_data.from_wallet_id == transfer_data.to_wallet_id:
+            WalletService.get_wallet(db, transfer_data.from_wallet_id, user)
             raise HTTPException(status_code=400, detail="Cannot transfer to the same wallet")
         
-        if from_wallet.balance < transfer_data.amount:
+        # Validate and lock wallets
+        WalletService.lock_wallets(db, [transfer_data.from_wallet_id, transfer_data.to_wallet_id], user)
+        amount = to_money(transfer_data.amount)
+        
+        # Debit only if the balance still covers the amount, so the check and the
+        # update cannot be split by a concurrent write
+        debited = db.query(Wallet).filter(
+            and_(Wallet.id == transfer_data.from_wallet_id, Wallet.balance >= amount)
+        ).update({
+            Wallet.balance: Wallet.balance - amount,
+            Wallet.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        if not debited:
+            db.rollback()
             raise HTTPException(status_code=400, detail="Insufficient balance in source wallet")
+        WalletService.apply_balance_delta(db, transfer_data.to_wallet_id, amount)
         
         # Create transfer record
         transfer = WalletTransfer(
             from_wallet_id=transfer_data.from_wallet_id,
             to_wallet_id=transfer_data.to_wallet_id,
-            amount=transfer_data.amount,
+            amount=amount,
             description=transfer_data.description,
             transfer_date=transfer_data.transfer_date or datetime.utcnow(),
             user_id=user.id
         )
         
-        # Update wallet balances
-        from_wallet.balance -= transfer_data.amount
-        to_wallet.balance += transfer_data.amount
-        from_wallet.updated_at = datetime.utcnow()
-        to_wallet.updated_at = datetime.utcnow()
-        
         db.add(transfer)
+        db.flush()
+        transfer_id = transfer.id
+        mark_user_changed(db, user.id)
         db.commit()
-        db.refresh(transfer)
-        return transfer
+        # Reload with both wallets in one query instead of a refresh plus two lazy loads
+        return db.query(WalletTransfer).options(
+            joinedload(WalletTransfer.from_wallet), joinedload(WalletTransfer.to_wallet)
+        ).filter(WalletTransfer.id == transfer_id).one()
     
     @staticmethod
     def adjust_balance(db: Session, adjustment_data: BalanceAdjustmentCreate, user: User) -> BalanceAdjustment:
         """Manually adjust wallet balance for reconciliation."""
-        wallet = WalletService.get_wallet(db, adjustment_data.wallet_id, user)
+        # Lock the row so old_balance cannot change before the new balance is written
+        wallet = WalletService.lock_wallets(db, [adjustment_data.wallet_id], user)[adjustment_data.wallet_id]
         
         old_balance = wallet.balance
-        adjustment_amount = adjustment_data.new_balance - old_balance
+        new_balance = to_money(adjustment_data.new_balance)
+        adjustment_amount = new_balance - old_balance
         
         adjustment = BalanceAdjustment(
             wallet_id=adjustment_data.wallet_id,
             old_balance=old_balance,
-            new_balance=adjustment_data.new_balance,
+            new_balance=new_balance,
             adjustment_amount=adjustment_amount,
             reason=adjustment_data.reason,
             user_id=user.id
         )
         
         # Update wallet balance
-        wallet.balance = adjustment_data.new_balance
+        wallet.balance = new_balance
         wallet.updated_at = datetime.utcnow()
         
         db.add(adjustment)
+        db.flush()
+        adjustment_id = adjustment.id
+        mark_user_changed(db, user.id)
         db.commit()
-        db.refresh(adjustment)
-        return adjustment
+        return db.query(BalanceAdjustment).options(
+            joinedload(BalanceAdjustment.wallet)
+        ).filter(BalanceAdjustment.id == adjustment_id).one()
     
     @staticmethod
     def get_wallet_analytics(db: Session, wallet_id: int, user: User, days: int = 30) -> WalletAnalytics:
@@ -189,20 +261,24 @@ class WalletService:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
-        # Get transactions for the period
-        transactions = db.query(Transaction).filter(
+        # Totals for the period in one aggregate rather than loading every transaction
+        totals = db.query(
+            func.sum(case((Transaction.transaction_type == "income", Transaction.amount))).label("total_income"),
+            func.sum(case((Transaction.transaction_type == "expense", Transaction.amount))).label("total_expenses"),
+            func.count(Transaction.id).label("transaction_count")
+        ).filter(
             and_(
                 Transaction.wallet_id == wallet_id,
                 Transaction.user_id == user.id,
                 Transaction.date >= start_date,
                 Transaction.date <= end_date
             )
-        ).all()
+        ).one()
         
-        total_income = sum(t.amount for t in transactions if t.transaction_type == "income")
-        total_expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
+        total_income = totals.total_income or 0
+        total_expenses = totals.total_expenses or 0
         net_change = total_income - total_expenses
-        transaction_count = len(transactions)
+        transaction_count = totals.transaction_count
         avg_transaction = (total_income + total_expenses) / transaction_count if transaction_count > 0 else 0
         
         return WalletAnalytics(
@@ -217,26 +293,93 @@ class WalletService:
         )
     
     @staticmethod
-    def get_wallet_history(db: Session, wallet_id: int, user: User, skip: int = 0, limit: int = 50) -> dict:
-        """Get transaction history for a specific wallet."""
+    def get_wallet_history(
+        db: Session,
+        wallet_id: int,
+        user: User,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        as_rows: bool = False
+    ) -> dict:
+        """Get transaction history for a specific wallet.
+        
+        Pass the returned next_cursor back as cursor to page with a keyset instead of
+        an offset. The total count costs an extra query and can be skipped with
+        include_total=False. With as_rows=True the transactions are rows holding only
+        the TransactionResponse columns.
+        """
         wallet = WalletService.get_wallet(db, wallet_id, user)
         
         # Get transactions with pagination
-        transactions_query = db.query(Transaction).filter(
+        entities = response_columns(Transaction, TransactionResponse) if as_rows else [Transaction]
+        transactions_query = db.query(*entities).filter(
             and_(Transaction.wallet_id == wallet_id, Transaction.user_id == user.id)
-        ).order_by(Transaction.date.desc())
+        )
         
-        total_count = transactions_query.count()
-        transactions = transactions_query.offset(skip).limit(limit).all()
+        total_count = transactions_query.count() if include_total else None
+        
+        transactions_query = transactions_query.order_by(Transaction.date.desc(), Transaction.id.desc())
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            transactions_query = transactions_query.filter(
+                tuple_(Transaction.date, Transaction.id) < tuple_(cursor_date, cursor_id)
+            )
+        else:
+            transactions_query = transactions_query.offset(skip)
+        transactions = transactions_query.limit(limit).all()
         
         return {
             "wallet": wallet,
             "transactions": transactions,
             "total_count": total_count,
-            "page": (skip // limit) + 1 if limit > 0 else 1,
-            "limit": limit
+            "page": (skip // limit) + 1 if limit > 0 and not cursor else 1,
+            "limit": limit,
+            "next_cursor": next_cursor(transactions, limit)
         }
     
+    @staticmethod
+    def get_transfers(db: Session, user: User, skip: int = 0, limit: int = 50, as_rows: bool = False) -> list:
+        """Get the user's transfers, newest first.
+        
+        With as_rows=True, returns rows of the WalletTransferResponse columns with both
+        wallets joined in, labelled from_wallet__* and to_wallet__*.
+        """
+        if not as_rows:
+            return db.query(WalletTransfer).options(
+                joinedload(WalletTransfer.from_wallet), joinedload(WalletTransfer.to_wallet)
+            ).filter(
+                WalletTransfer.user_id == user.id
+            ).order_by(WalletTransfer.transfer_date.desc()).offset(skip).limit(limit).all()
+        
+        from_wallet = aliased(Wallet)
+        to_wallet = aliased(Wallet)
+        return db.query(
+            *response_columns(WalletTransfer, WalletTransferResponse),
+            *response_columns(from_wallet, WalletResponse, "from_wallet__"),
+            *response_columns(to_wallet, WalletResponse, "to_wallet__")
+        ).join(
+            from_wallet, from_wallet.id == WalletTransfer.from_wallet_id
+        ).join(
+            to_wallet, to_wallet.id == WalletTransfer.to_wallet_id
+        ).filter(
+            WalletTransfer.user_id == user.id
+        ).order_by(WalletTransfer.transfer_date.desc()).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def get_balance_adjustments(db: Session, wallet_id: int, user: User, skip: int = 0, limit: int = 20) -> List[BalanceAdjustment]:
+        """Get balance adjustments for a wallet, newest first."""
+        # Verify wallet ownership; every adjustment then shares this loaded wallet
+        wallet = WalletService.get_wallet(db, wallet_id, user)
+        
+        adjustments = db.query(BalanceAdjustment).filter(
+            and_(BalanceAdjustment.wallet_id == wallet_id, BalanceAdjustment.user_id == user.id)
+        ).order_by(BalanceAdjustment.adjusted_at.desc()).offset(skip).limit(limit).all()
+        for adjustment in adjustments:
+            set_committed_value(adjustment, "wallet", wallet)
+        return adjustments
+    
     @staticmethod
     def get_default_wallet(db: Session, user: User) -> Optional[Wallet]:
         """Get user's default wallet."""
@@ -245,14 +388,21 @@ class WalletService:
         ).first()
     
     @staticmethod
-    def update_wallet_balance(db: Session, wallet_id: int, amount: float, transaction_type: str):
-        """Update wallet balance when a transaction is created/updated/deleted."""
-        wallet = db.query(Wallet).filter(Wallet.id == wallet_id).first()
-        if wallet:
-            if transaction_type == "income":
-                wallet.balance += amount
-            elif transaction_type == "expense":
-                wallet.balance -= amount
-            
-            wallet.updated_at = datetime.utcnow()
-            db.commit()
+    def apply_balance_delta(db: Session, wallet_id: int, delta):
+        """Add a signed amount to a wallet balance in a single UPDATE, without committing."""
+        db.query(Wallet).filter(Wallet.id == wallet_id).update({
+            Wallet.balance: Wallet.balance + to_money(delta),
+            Wallet.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+    
+    @staticmethod
+    def update_wallet_balance(db: Session, wallet_id: int, amount, transaction_type: str):
+        """Update wallet balance when a transaction is created/updated/deleted.
+        
+        Applied as an atomic UPDATE without committing; the caller commits it together
+        with the transaction change.
+        """
+        if transaction_type == "income":
+            WalletService.apply_balance_delta(db, wallet_id, amount)
+        elif transaction_type == "expense":
+            WalletService.apply_balance_delta(db, wallet_id, -amount)
@@ -10,20 +10,44 @@ This application has been split into multiple modules for better organization:
 - app/api/: API route handlers
 
 To run the application, you can use: python main.py
+For production (several worker processes), use: python serve.py
 """
 
+import logging
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 
 from app.core.config import settings
-from app.core.database import create_tables
-from app.api import auth, transactions, wallets
+from app.core.database import engine
+from app.core.metrics import MetricsMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.api import auth, transactions, wallets, metrics
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the threadpool, then run the opt-in schema check or migration before serving.
+    
+    Importing the app never touches the DB.
+    """
+    # Sync routes and dependencies run on anyio's default thread limiter
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.WEB_THREADPOOL_SIZE
+    if settings.DB_SCHEMA_ON_STARTUP != "off":
+        from app.core.migrations import ensure_schema
+        ensure_schema(engine, settings.DB_SCHEMA_ON_STARTUP)
+    yield
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_TITLE,
-    version=settings.APP_VERSION
+    version=settings.APP_VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -33,15 +57,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+# Per-request query count and DB time (log line, and Server-Timing in debug mode)
+app.add_middleware(QueryStatsMiddleware)
+# Prometheus request metrics, served at /metrics
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
+if settings.ASYNC_DB:
+    # Async handlers take precedence over the sync ones for the paths they cover
+    from app.api import async_routes
+    app.include_router(async_routes.router, tags=["async"])
 app.include_router(auth.router, tags=["authentication"])
 app.include_router(transactions.router, tags=["transactions"])
 app.include_router(wallets.router, tags=["wallets"])
-
-# Create database tables
-create_tables()
+app.include_router(metrics.router, tags=["metrics"])
 
 @app.get("/")
 def read_root():
@@ -49,4 +80,5 @@ def read_root():
     return {"message": "Money Tracker API", "version": settings.APP_VERSION}
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,9 @@
+"""Latency statistics shared by the benchmark and load test scripts."""
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,112 @@
+"""
+Concurrency benchmark for comparing the sync and async request paths.
+Starts many concurrent clients against a running API and reports requests/sec and
+latency percentiles for the read endpoints. Run it once against a server started with
+ASYNC_DB=false and once with ASYNC_DB=true, using the same database and client count.
+
+Usage: python scripts/bench_concurrency.py [--url http://localhost:8000] [--clients 500]
+"""
+
+import sys
+import json
+import time
+import uuid
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from _stats import percentile
+
+ENDPOINTS = ["/dashboard", "/transactions?limit=50", "/wallets", "/wallets/summary",
+             "/analytics/category-spending"]
+
+def get_token(url: str) -> str:
+    """Register a throwaway user with one transaction and return its access token."""
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    body = json.dumps({"username": username, "email": f"{username}@example.com", "password": "bench"}).encode()
+    urllib.request.urlopen(urllib.request.Request(
+        f"{url}/register", data=body, headers={"Content-Type": "application/json"}
+    )).read()
+    form = urllib.parse.urlencode({"username": username, "password": "bench"}).encode()
+    with urllib.request.urlopen(urllib.request.Request(f"{url}/token", data=form)) as response:
+        token = json.loads(response.read())["access_token"]
+    transaction = json.dumps({
+        "amount": 10, "category": "Food", "description": "bench",
+        "transaction_type": "expense", "date": "2024-01-01T00:00:00"
+    }).encode()
+    urllib.request.urlopen(urllib.request.Request(
+        f"{url}/transactions", data=transaction,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+    )).read()
+    return token
+
+def run(url: str, token: str, clients: int, duration: float) -> dict:
+    """Hit the read endpoints from many threads and collect latencies and errors."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start_event = threading.Event()
+    deadline = [0.0]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    def worker(offset: int):
+        start_event.wait()
+        i = offset
+        while time.monotonic() < deadline[0]:
+            path = ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url + path, headers=headers), timeout=60) as r:
+                    r.read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+    
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    deadline[0] = time.monotonic() + duration
+    started = time.monotonic()
+    start_event.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests/sec under many concurrent clients")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+    
+    try:
+        token = get_token(args.url)
+    except urllib.error.URLError as e:
+        print(f"❌ Could not prepare the benchmark user: {e}")
+        sys.exit(1)
+    
+    print(f"🚀 {args.clients} clients for {args.duration:.0f}s against {args.url}")
+    result = run(args.url, token, args.clients, args.duration)
+    print(f"requests={result['requests']} errors={result['errors']} rps={result['rps']:.1f} "
+          f"p50={result['p50']:.1f}ms p95={result['p95']:.1f}ms p99={result['p99']:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Login storm benchmark.
+Measures /dashboard latency against a running API, first on its own and then while many
+clients hammer POST /token. With password hashing on its own bounded pool, the dashboard
+p99 should stay close to the baseline and excess logins should get 429 responses.
+
+Usage: python scripts/bench_login_storm.py [--url http://localhost:8000] [--login-clients 100]
+"""
+
+import sys
+import json
+import time
+import uuid
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from _stats import percentile
+
+def request(url: str, data: bytes = None, headers: dict = None) -> int:
+    """Issue a request and return the HTTP status code."""
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def measure_dashboard(url: str, token: str, duration: float, clients: int) -> list:
+    """Poll /dashboard from several threads and return latencies in milliseconds."""
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    def worker():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            request(f"{url}/dashboard", headers=headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+    
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+def login_storm(url: str, username: str, password: str, clients: int, stop: threading.Event) -> dict:
+    """Start login threads that run until stop is set; returns live status counters."""
+    counts = {}
+    lock = threading.Lock()
+    form = urllib.parse.urlencode({"username": username, "password": password}).encode()
+    
+    def worker():
+        while not stop.is_set():
+            code = request(f"{url}/token", data=form,
+                           headers={"Content-Type": "application/x-www-form-urlencoded"})
+            with lock:
+                counts[code] = counts.get(code, 0) + 1
+    
+    for _ in range(clients):
+        threading.Thread(target=worker, daemon=True).start()
+    return counts
+
+def report(label: str, latencies: list):
+    print(f"{label:<22} n={len(latencies):<6} "
+          f"p50={percentile(latencies, 50):7.1f}ms "
+          f"p95={percentile(latencies, 95):7.1f}ms "
+          f"p99={percentile(latencies, 99):7.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard latency during a login storm")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    parser.add_argument("--dashboard-clients", type=int, default=4)
+    parser.add_argument("--login-clients", type=int, default=100)
+    args = parser.parse_args()
+    
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    password = "bench-password"
+    body = json.dumps({"username": username, "email": f"{username}@example.com", "password": password})
+    if request(f"{args.url}/register", data=body.encode(), headers={"Content-Type": "application/json"}) != 200:
+        print("❌ Could not register the benchmark user")
+        sys.exit(1)
+    form = urllib.parse.urlencode({"username": username, "password": password}).encode()
+    with urllib.request.urlopen(urllib.request.Request(f"{args.url}/token", data=form)) as response:
+        token = json.loads(response.read())["access_token"]
+    
+    print(f"🚀 Benchmarking {args.url} for {args.duration:.0f}s per phase")
+    baseline = measure_dashboard(args.url, token, args.duration, args.dashboard_clients)
+    report("dashboard (idle)", baseline)
+    
+    stop = threading.Event()
+    counts = login_storm(args.url, username, password, args.login_clients, stop)
+    try:
+        during = measure_dashboard(args.url, token, args.duration, args.dashboard_clients)
+    finally:
+        stop.set()
+    report("dashboard (storm)", during)
+    print(f"login responses        {dict(sorted(counts.items()))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Serialization micro-benchmark for the list endpoints.
+Compares the previous path (ORM instances re-validated through the response model and
+rendered by JSONResponse) with the row path (response columns straight to ORJSONResponse)
+for 100/1000/10000-row payloads. Runs against a private in-memory SQLite database, and
+checks that both paths produce the same JSON before timing them.
+
+Usage: python scripts/bench_serialization.py [--sizes 100 1000 10000] [--repeat 20]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from typing import List
+
+from app.core.database import Base
+from app.core.serialization import rows_to_dicts
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionResponse
+from app.services.transaction_service import TransactionService
+
+def seed(db, count: int) -> User:
+    """Create a user with one wallet and count transactions."""
+    user = User(username="bench", email="bench@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    wallet = Wallet(name="Bench", wallet_type="cash", balance=0, user_id=user.id, is_default=True)
+    db.add(wallet)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    db.bulk_insert_mappings(Transaction, [
+        {
+            "amount": (i % 500) + 0.25, "category": "Food", "description": f"item {i}",
+            "transaction_type": "expense" if i % 3 else "income", "date": start + timedelta(minutes=i),
+            "created_at": start, "user_id": user.id, "wallet_id": wallet.id
+        }
+        for i in range(count)
+    ])
+    db.commit()
+    return user
+
+def orm_path(db, user: User, limit: int) -> bytes:
+    """What the endpoint did before: ORM rows, response_model validation, JSONResponse."""
+    adapter = TypeAdapter(List[TransactionResponse])
+    transactions = TransactionService.get_transactions(db, user, 0, limit)
+    content = adapter.dump_python(adapter.validate_python(transactions, from_attributes=True), mode="json")
+    return JSONResponse(content).body
+
+def row_path(db, user: User, limit: int) -> bytes:
+    """What the endpoint does now: response columns straight to ORJSONResponse."""
+    rows = TransactionService.get_transactions(db, user, 0, limit, as_rows=True)
+    return ORJSONResponse(rows_to_dicts(rows)).body
+
+def best_of(fn, repeat: int) -> float:
+    """Return the fastest of repeat runs in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM + response_model vs row serializers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    import app.models  # noqa: F401
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    with SessionLocal() as db:
+        user = seed(db, max(args.sizes))
+    
+    def in_session(path, size: int) -> bytes:
+        # A fresh session per call, as each request gets one
+        with SessionLocal() as db:
+            return path(db, user, size)
+    
+    print(f"{'rows':>6} {'orm+pydantic':>14} {'rows+orjson':>13} {'speedup':>8}")
+    for size in args.sizes:
+        if json.loads(in_session(orm_path, size)) != json.loads(in_session(row_path, size)):
+            print(f"❌ Outputs differ for {size} rows")
+            sys.exit(1)
+        orm_ms = best_of(lambda: in_session(orm_path, size), args.repeat)
+        row_ms = best_of(lambda: in_session(row_path, size), args.repeat)
+        print(f"{size:>6} {orm_ms:>12.2f}ms {row_ms:>11.2f}ms {orm_ms / row_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Startup time benchmark.
+Measures, in fresh interpreters, how long `import main` takes and how long a uvicorn
+worker takes from process start to its first successful response (the cold start a
+rolling restart or a new autoscaled instance pays), and lists the slowest imports.
+Exits with status 1 when the median cold start exceeds the budget.
+
+Usage: python scripts/bench_startup.py [--runs 5] [--budget-ms 2000] [--port 8123]
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+import subprocess
+import urllib.request
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+def time_import() -> float:
+    """Seconds spent importing main in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def time_cold_start(port: int, timeout: float = 30.0) -> float:
+    """Seconds from spawning a uvicorn worker to its first 200 response."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.005)
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        raise RuntimeError(f"no response within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def slowest_imports(limit: int = 10) -> list:
+    """(milliseconds, module) of the slowest top-level imports under `import main`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR, capture_output=True, text=True
+    ).stderr
+    lines = [line.split("|") for line in stderr.splitlines() if line.startswith("import time:")]
+    # Children are listed before their parent, so everything after the interpreter's own
+    # "site" entry (and what .pth files pull in) belongs to main
+    sites = [index for index, (_, _, name) in enumerate(lines) if name.strip() == "site"]
+    modules = []
+    for _, cumulative, name in lines[sites[-1] + 1 if sites else 0:]:
+        # Nesting is shown by two spaces per level; main itself is at level 0
+        if len(name) - len(name.lstrip()) != 3 or not cumulative.strip().isdigit():
+            continue
+        modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:limit]
+
+def summary(label: str, seconds: list) -> str:
+    milliseconds = [value * 1000 for value in seconds]
+    return (
+        f"{label:<12} median {statistics.median(milliseconds):7.0f}ms"
+        f"   min {min(milliseconds):7.0f}ms   max {max(milliseconds):7.0f}ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application import and cold start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000, help="Maximum median cold start")
+    parser.add_argument("--port", type=int, default=8123)
+    args = parser.parse_args()
+    
+    # Warm the bytecode cache so the first run is not an outlier
+    time_import()
+    imports = [time_import() for _ in range(args.runs)]
+    cold_starts = [time_cold_start(args.port) for _ in range(args.runs)]
+    
+    print(summary("import main", imports))
+    print(summary("cold start", cold_starts))
+    print("\nSlowest imports:")
+    for milliseconds, module in slowest_imports():
+        print(f"  {milliseconds:7.1f}ms  {module}")
+    
+    median = statistics.median(cold_starts) * 1000
+    if median > args.budget_ms:
+        print(f"\n❌ Median cold start {median:.0f}ms exceeds the {args.budget_ms:.0f}ms budget")
+        sys.exit(1)
+    print(f"\n✅ Median cold start {median:.0f}ms is within the {args.budget_ms:.0f}ms budget")
+
+if __name__ == "__main__":
+    main()
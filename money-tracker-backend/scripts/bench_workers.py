@@ -0,0 +1,85 @@
+"""
+Worker scaling benchmark.
+Starts serve.py with each WEB_WORKERS value in turn, runs scripts/load_test.py against
+it (seeded accounts, see scripts/seed_data.py) and prints throughput and latency per
+worker count with the speedup over one worker. Writes from every run stay in the
+database, so point DATABASE_URL at a scratch copy.
+
+Usage: python scripts/bench_workers.py [--workers 1,2,4] [--users 32] [--duration 30] [--port 8130]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def default_worker_counts() -> str:
+    """Powers of two up to the CPU count, plus the CPU count itself."""
+    cpus = os.cpu_count() or 1
+    counts = [n for n in (1, 2, 4, 8, 16, 32, 64) if n <= cpus]
+    if cpus not in counts:
+        counts.append(cpus)
+    return ",".join(str(n) for n in counts)
+
+def wait_until_up(url: str, server: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"serve.py exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(url + "/", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server not up within {timeout:.0f}s")
+
+def run(workers: int, args) -> dict:
+    """Serve with the given worker count and return load_test's total row."""
+    url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, WEB_WORKERS=str(workers), WEB_PORT=str(args.port), LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [sys.executable, "serve.py"], cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(url, server)
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            subprocess.run([
+                sys.executable, "scripts/load_test.py", "--url", url, "--users", str(args.users),
+                "--duration", str(args.duration), "--output", output.name
+            ], cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL)
+            with open(output.name) as f:
+                return json.load(f)["results"]["total"]
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of serve.py by worker count")
+    parser.add_argument("--workers", default=default_worker_counts(), help="Comma-separated worker counts")
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--port", type=int, default=8130)
+    args = parser.parse_args()
+    
+    worker_counts = [int(n) for n in args.workers.split(",")]
+    cpus = os.cpu_count() or 1
+    if max(worker_counts) > cpus:
+        print(f"⚠️  Only {cpus} CPU(s): runs with more workers than CPUs measure contention, not scaling")
+    print(f"{'workers':>7} {'rps':>8} {'speedup':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'fail':>6}")
+    baseline = None
+    for workers in worker_counts:
+        total = run(workers, args)
+        baseline = baseline or total["rps"]
+        print(f"{workers:>7} {total['rps']:>8.1f} {total['rps'] / baseline:>7.2f}x "
+              f"{total['p50']:>7.1f}ms {total['p95']:>7.1f}ms {total['p99']:>7.1f}ms {total['failures']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Backend parity check.
+Runs the same service-level scenario (wallets, transactions with edits and deletes,
+transfers, a balance adjustment, a CSV import, then the dashboard, listings, category
+spending, time series and wallet analytics) against an in-memory SQLite database and a
+second database, and exits with status 1 if any result differs. The second database is a
+temporary SQLite file (WAL, pooled connections) unless --url is given. That default run
+only covers the SQLite file mode; pass a PostgreSQL URL to check the production dialect,
+which the output points out when it was not. Ids, cursors and server timestamps are
+left out of the comparison. The scenario's rows are deleted again afterwards.
+
+Usage: python scripts/check_backend_parity.py [--url postgresql+psycopg2://...]
+"""
+
+import sys
+import os
+import io
+import uuid
+import random
+import argparse
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The engines used here are built below; keep the app's own from needing a server
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, engine_options
+from app.core.dialect import configure_engine
+from app.models.user import User
+from app.models.wallet import Wallet, WalletTransfer, BalanceAdjustment
+from app.models.transaction import Transaction, TransactionRollup
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.schemas.wallet import WalletCreate, WalletTransferCreate, BalanceAdjustmentCreate
+from app.services.import_service import ImportService
+from app.services.transaction_service import TransactionService
+from app.services.wallet_service import WalletService
+
+CATEGORIES = ["Food", "Transport", "Shopping", "Entertainment", "Healthcare", "Education", "Other"]
+
+# Differ between databases (or runs) without the results being different
+IGNORED_KEYS = {
+    "id", "user_id", "wallet_id", "from_wallet_id", "to_wallet_id",
+    "created_at", "updated_at", "adjusted_at", "next_cursor"
+}
+
+def normalize(value):
+    """Plain, comparable data for a service result."""
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    elif isinstance(value, Row):
+        value = value._asdict()
+    elif hasattr(value, "__table__"):
+        value = {column.key: getattr(value, column.key) for column in value.__table__.columns}
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items() if key not in IGNORED_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if isinstance(value, (Decimal, float)):
+        return round(float(value), 6)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def first_difference(a, b, path: str = "") -> str:
+    """Path and values of the first place where a and b differ."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in sorted(set(a) | set(b), key=str):
+            if a.get(key) != b.get(key):
+                return first_difference(a.get(key), b.get(key), f"{path}.{key}")
+    elif isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        for index, (x, y) in enumerate(zip(a, b)):
+            if x != y:
+                return first_difference(x, y, f"{path}[{index}]")
+    return f"{path or '.'}: {a!r} != {b!r}"
+
+def run_scenario(db, today: datetime) -> dict:
+    """Write the scenario's data through the services and return every result by step."""
+    results = {}
+    
+    def record(step: str, call):
+        try:
+            results[step] = normalize(call())
+        except HTTPException as e:
+            results[step] = {"status_code": e.status_code, "detail": e.detail}
+    
+    user = User(username=f"parity_{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@example.com",
+                hashed_password="-")
+    db.add(user)
+    db.commit()
+    
+    cash, bank, savings = [
+        WalletService.create_wallet(db, WalletCreate(
+            name=name, wallet_type=wallet_type, initial_balance=balance, is_default=name == "Cash"
+        ), user)
+        for name, wallet_type, balance in (("Cash", "cash", 500), ("Bank", "bank_account", 2500.5), ("Savings", "savings", 0))
+    ]
+    
+    rng = random.Random(7)
+    created = []
+    for n in range(80):
+        created.append(TransactionService.create_transaction(db, TransactionCreate(
+            amount=round(rng.uniform(1, 300), 2), category=rng.choice(CATEGORIES), description=f"parity {n}",
+            transaction_type="income" if n % 6 == 0 else "expense",
+            date=today - timedelta(days=rng.randint(0, 150), hours=rng.randint(0, 23)),
+            wallet_id=rng.choice([cash.id, bank.id])
+        ), user).id)
+    record("update amount", lambda: TransactionService.update_transaction(
+        db, created[3], TransactionUpdate(amount=42.42), user))
+    record("update wallet and type", lambda: TransactionService.update_transaction(
+        db, created[10], TransactionUpdate(wallet_id=savings.id, transaction_type="income"), user))
+    record("update date", lambda: TransactionService.update_transaction(
+        db, created[20], TransactionUpdate(date=today - timedelta(days=400)), user))
+    record("delete", lambda: TransactionService.delete_transaction(db, created[30], user))
+    
+    record("transfer", lambda: WalletService.transfer_money(db, WalletTransferCreate(
+        from_wallet_id=bank.id, to_wallet_id=savings.id, amount=700.25, transfer_date=today - timedelta(days=2)
+    ), user))
+    record("transfer over balance", lambda: WalletService.transfer_money(db, WalletTransferCreate(
+        from_wallet_id=savings.id, to_wallet_id=cash.id, amount=1000000, transfer_date=today
+    ), user))
+    record("adjust balance", lambda: WalletService.adjust_balance(db, BalanceAdjustmentCreate(
+        wallet_id=cash.id, new_balance=321.09, reason="count"
+    ), user))
+    csv_file = io.BytesIO((
+        "date,amount,category,description,transaction_type\n"
+        f"{(today - timedelta(days=1)).date()},12.34,Food,lunch,expense\n"
+        f"{(today - timedelta(days=40)).date()},1500,Other,bonus,income\n"
+        f"{today.date()},-5,Food,refund,expense\n"
+        f"{(today - timedelta(days=70)).date()},99.99,Shopping,shoes,expense\n"
+    ).encode())
+    record("import csv", lambda: ImportService.import_transactions(db, csv_file, "csv", user, bank.id))
+    
+    start, end = (today - timedelta(days=120)).date(), today.date()
+    record("dashboard", lambda: TransactionService.get_dashboard_data(db, user))
+    record("transactions", lambda: TransactionService.get_transactions(db, user, limit=25))
+    record("transactions by category", lambda: TransactionService.get_transactions(db, user, category="Food"))
+    record("category spending", lambda: TransactionService.get_category_spending(db, user))
+    record("category spending range", lambda: TransactionService.get_category_spending(
+        db, user, start=start + timedelta(days=9), end=end - timedelta(days=3)))
+    record("category spending wallet top 3", lambda: TransactionService.get_category_spending(
+        db, user, wallet_id=bank.id, top=3))
+    for interval in ("day", "week", "month"):
+        record(f"time series {interval}", lambda: TransactionService.get_time_series(
+            db, user, interval, start=start, end=end))
+    record("time series by category", lambda: TransactionService.get_time_series(
+        db, user, "month", start=start, end=end, wallet_id=cash.id, group_by="category"))
+    record("wallets summary", lambda: WalletService.get_wallets_summary(db, user))
+    for wallet in (cash, bank, savings):
+        record(f"analytics {wallet.name}", lambda: WalletService.get_wallet_analytics(db, wallet.id, user, days=60))
+    
+    def history_pages():
+        first = WalletService.get_wallet_history(db, bank.id, user, limit=15)
+        second = WalletService.get_wallet_history(db, bank.id, user, limit=15, cursor=first["next_cursor"])
+        return [first, second]
+    
+    record("wallet history", history_pages)
+    record("transfers", lambda: WalletService.get_transfers(db, user))
+    record("adjustments", lambda: WalletService.get_balance_adjustments(db, cash.id, user))
+    record("delete wallet", lambda: WalletService.delete_wallet(db, savings.id, user))
+    record("wallets", lambda: WalletService.get_wallets(db, user, include_inactive=True))
+    
+    db.query(BalanceAdjustment).filter(BalanceAdjustment.user_id == user.id).delete()
+    db.query(WalletTransfer).filter(WalletTransfer.user_id == user.id).delete()
+    db.query(TransactionRollup).filter(TransactionRollup.user_id == user.id).delete()
+    db.query(Transaction).filter(Transaction.user_id == user.id).delete()
+    db.query(Wallet).filter(Wallet.user_id == user.id).delete()
+    db.query(User).filter(User.id == user.id).delete()
+    db.commit()
+    return results
+
+def run_on(url: str, today: datetime) -> tuple:
+    """(results, seconds) of the scenario on a fresh engine for url."""
+    engine = create_engine(url, **engine_options(url))
+    configure_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        started = time.perf_counter()
+        results = run_scenario(db, today)
+        return results, time.perf_counter() - started
+    finally:
+        db.close()
+        engine.dispose()
+
+def main():
+    import app.models  # noqa: F401
+    parser = argparse.ArgumentParser(description="Compare service results on two database backends")
+    parser.add_argument("--url", help="Database to compare with in-memory SQLite (default: a temporary SQLite file)")
+    args = parser.parse_args()
+    
+    # Both runs see the same dates, even across midnight
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    with tempfile.TemporaryDirectory() as directory:
+        other_url = args.url or f"sqlite:///{os.path.join(directory, 'parity.db')}"
+        baseline, baseline_seconds = run_on("sqlite://", today)
+        other, other_seconds = run_on(other_url, today)
+    
+    print(f"🔄 sqlite:// ({baseline_seconds:.2f}s) vs {other_url.split('@')[-1]} ({other_seconds:.2f}s)")
+    failures = 0
+    for step, result in baseline.items():
+        if result == other.get(step):
+            print(f"✅ {step}")
+        else:
+            failures += 1
+            print(f"❌ {step}: {first_difference(result, other.get(step))}")
+    
+    if make_url(other_url).get_backend_name() == "sqlite":
+        print("\n⚠️  Both runs used SQLite, so the PostgreSQL dialect was not checked; "
+              "pass --url postgresql+psycopg2://... for that")
+    if failures:
+        print(f"\n❌ {failures} of {len(baseline)} steps differ between the backends")
+        sys.exit(1)
+    print(f"\n🎉 All {len(baseline)} steps match")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Statement count regression check for the wallet listings.
+Seeds a private in-memory SQLite database, then runs the transfer and adjustment
+listings (and the transfer/adjustment writes that return nested wallets) followed by the
+same serialization their response_model performs, counting the SQL statements issued.
+Each must stay within a fixed budget that does not grow with the page size; lazy loads
+of from_wallet/to_wallet/wallet per row would push them over. The wallets summary is
+also run for a user with one wallet and a user with many wallets holding different
+numbers of transactions, and must issue the same number of statements for both.
+Exits with status 1 on any regression.
+
+Usage: python scripts/check_query_counts.py
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+from typing import List
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The engines used here are built below; keep the app's own from needing a server
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.user import User
+from app.models.wallet import Wallet, WalletTransfer, BalanceAdjustment
+from app.models.transaction import Transaction
+from app.schemas.wallet import (
+    WalletTransferCreate, WalletTransferResponse, BalanceAdjustmentCreate, BalanceAdjustmentResponse,
+    WalletSummary
+)
+from app.services.wallet_service import WalletService
+
+ROWS = 100
+# Wallets of the many-wallet user in the summary check; wallet n holds n * 3 transactions
+SUMMARY_WALLETS = 12
+
+def seed(db) -> tuple:
+    """Create a user with three wallets, ROWS transfers and ROWS adjustments."""
+    user = User(username="counts", email="counts@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    wallets = [
+        Wallet(name=f"Wallet {n}", wallet_type="cash", balance=100000, user_id=user.id, is_default=n == 0)
+        for n in range(3)
+    ]
+    db.add_all(wallets)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    for i in range(ROWS):
+        db.add(WalletTransfer(
+            from_wallet_id=wallets[i % 3].id, to_wallet_id=wallets[(i + 1) % 3].id, amount=1,
+            transfer_date=start + timedelta(hours=i), user_id=user.id
+        ))
+        db.add(BalanceAdjustment(
+            wallet_id=wallets[0].id, old_balance=0, new_balance=1, adjustment_amount=1,
+            adjusted_at=start + timedelta(hours=i), user_id=user.id
+        ))
+    db.commit()
+    return user.id, [wallet.id for wallet in wallets]
+
+def seed_summary_user(db, name: str, wallet_count: int) -> int:
+    """Create a user with wallet_count wallets, wallet n holding n * 3 transactions."""
+    user = User(username=name, email=f"{name}@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    wallets = [
+        Wallet(name=f"Wallet {n}", wallet_type="cash", balance=0, user_id=user.id, is_default=n == 0)
+        for n in range(wallet_count)
+    ]
+    db.add_all(wallets)
+    db.flush()
+    for n, wallet in enumerate(wallets):
+        for i in range(n * 3):
+            db.add(Transaction(
+                amount=1, category="Food", description="count", transaction_type="expense",
+                date=datetime(2024, 1, 1) + timedelta(hours=i), user_id=user.id, wallet_id=wallet.id
+            ))
+    db.commit()
+    return user.id
+
+def main():
+    import app.models  # noqa: F401
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    
+    with SessionLocal() as db:
+        user_id, wallet_ids = seed(db)
+        single_wallet_user_id = seed_summary_user(db, "one_wallet", 1)
+        many_wallets_user_id = seed_summary_user(db, "many_wallets", SUMMARY_WALLETS)
+    
+    def run(fn, response_model, owner_id: int = None) -> int:
+        """Run fn in a fresh session, serialize like the route would and count statements."""
+        with SessionLocal() as db:
+            user = db.get(User, owner_id or user_id)
+            statements.clear()
+            adapter = TypeAdapter(response_model)
+            adapter.dump_python(adapter.validate_python(fn(db, user), from_attributes=True), mode="json")
+            return len(statements)
+    
+    # (name, function, response model, statement budget). The writes include the
+    # statement that takes SQLite's write lock in place of SELECT ... FOR UPDATE.
+    checks = [
+        ("transfers (ORM)", lambda db, user: WalletService.get_transfers(db, user, 0, ROWS),
+         List[WalletTransferResponse], 1),
+        ("transfers (rows)", lambda db, user: [
+            row._asdict() for row in WalletService.get_transfers(db, user, 0, ROWS, as_rows=True)
+        ], list, 1),
+        ("adjustments", lambda db, user: WalletService.get_balance_adjustments(db, wallet_ids[0], user, 0, ROWS),
+         List[BalanceAdjustmentResponse], 2),
+        ("transfer_money", lambda db, user: WalletService.transfer_money(
+            db, WalletTransferCreate(from_wallet_id=wallet_ids[0], to_wallet_id=wallet_ids[1], amount=5), user
+        ), WalletTransferResponse, 6),
+        ("adjust_balance", lambda db, user: WalletService.adjust_balance(
+            db, BalanceAdjustmentCreate(wallet_id=wallet_ids[2], new_balance=42), user
+        ), BalanceAdjustmentResponse, 5),
+    ]
+    
+    ok = True
+    for name, fn, response_model, budget in checks:
+        count = run(fn, response_model)
+        status = "✅" if count <= budget else "❌"
+        ok = ok and count <= budget
+        print(f"{status} {name}: {count} statements (budget {budget})")
+    
+    # The summary counts every wallet's transactions in one query, whatever their number
+    single = run(WalletService.get_wallets_summary, List[WalletSummary], single_wallet_user_id)
+    many = run(WalletService.get_wallets_summary, List[WalletSummary], many_wallets_user_id)
+    status = "✅" if single == many else "❌"
+    ok = ok and single == many
+    print(f"{status} wallets summary: {single} statements for 1 wallet, {many} for {SUMMARY_WALLETS} wallets")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Query plan check for the service layer.
+Seeds a large synthetic dataset inside a transaction, runs the read queries issued by
+TransactionService, WalletService and the listing endpoints, and EXPLAINs each captured
+statement. Exits with status 1 if any of them plans a sequential scan on a large table.
+Everything is rolled back at the end, so no data is left behind.
+
+Requires PostgreSQL. Run it against a development or staging database:
+    python scripts/check_query_plans.py [--users 2000] [--transactions-per-wallet 50]
+"""
+
+import sys
+import os
+import argparse
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.database import engine
+from app.core.pagination import encode_cursor
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.services.transaction_service import TransactionService
+from app.services.wallet_service import WalletService
+from app.services.user_service import UserService
+from app.api import wallets as wallets_api
+
+# Tables that grow with usage; a sequential scan on any of them is a regression
+CHECKED_TABLES = {
+    "users", "wallets", "transactions", "transaction_rollups",
+    "wallet_transfers", "balance_adjustments"
+}
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (username, email, hashed_password, created_at)
+    SELECT 'plan_user_' || g, 'plan_user_' || g || '@example.com', 'x', now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO wallets (name, wallet_type, icon, color, balance, is_default, is_active,
+                         description, user_id, created_at, updated_at)
+    SELECT 'Wallet ' || w, 'cash', 'wallet', '#4F46E5', 0, w = 1, w < 3, NULL, u.id,
+           now() - (w || ' days')::interval, now()
+    FROM users u CROSS JOIN generate_series(1, 3) w
+    WHERE u.username LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO transactions (amount, category, description, transaction_type, date,
+                              created_at, user_id, wallet_id)
+    SELECT round((random() * 100)::numeric, 2),
+           (ARRAY['Food', 'Transport', 'Shopping', 'Entertainment', 'Healthcare', 'Education', 'Other'])[1 + g % 7],
+           'seed', CASE WHEN g % 5 = 0 THEN 'income' ELSE 'expense' END,
+           now() - (random() * 1500 || ' days')::interval, now(), w.user_id, w.id
+    FROM wallets w JOIN users u ON u.id = w.user_id
+    CROSS JOIN generate_series(1, :per_wallet) g
+    WHERE u.username LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO transaction_rollups (user_id, wallet_id, category, transaction_type, period,
+                                     total_amount, transaction_count)
+    SELECT t.user_id, t.wallet_id, t.category, t.transaction_type, date_trunc('month', t.date)::date,
+           sum(t.amount), count(*)
+    FROM transactions t JOIN users u ON u.id = t.user_id
+    WHERE u.username LIKE 'plan_user_%'
+    GROUP BY 1, 2, 3, 4, 5
+    """,
+    """
+    INSERT INTO wallet_transfers (amount, description, transfer_date, created_at,
+                                  from_wallet_id, to_wallet_id, user_id)
+    SELECT 10, 'seed', now() - (g || ' days')::interval, now(), w.id, w.id, w.user_id
+    FROM wallets w JOIN users u ON u.id = w.user_id
+    CROSS JOIN generate_series(1, 5) g
+    WHERE u.username LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO balance_adjustments (wallet_id, old_balance, new_balance, adjustment_amount,
+                                     reason, adjusted_at, user_id)
+    SELECT w.id, 0, 1, 1, 'seed', now() - (g || ' days')::interval, w.user_id
+    FROM wallets w JOIN users u ON u.id = w.user_id
+    CROSS JOIN generate_series(1, 5) g
+    WHERE u.username LIKE 'plan_user_%'
+    """,
+]
+
+def run_service_queries(db: Session, user: User, wallet: Wallet):
+    """Issue every read query the API runs on behalf of a single user."""
+    first_page = TransactionService.get_transactions(db, user, limit=50)
+    TransactionService.get_transactions(db, user, limit=50, category="Food")
+    if first_page:
+        cursor = encode_cursor(first_page[-1].date, first_page[-1].id)
+        TransactionService.get_transactions(db, user, limit=50, cursor=cursor)
+    TransactionService.get_dashboard_data(db, user)
+    TransactionService.get_category_spending(db, user)
+    # A range with partial months at both edges, so rollups and transactions are both read
+    today = date.today()
+    TransactionService.get_category_spending(db, user, today - timedelta(days=100), today - timedelta(days=10), wallet.id, 5)
+    for interval in ("day", "week", "month"):
+        TransactionService.get_time_series(db, user, interval)
+    TransactionService.get_time_series(db, user, "week", wallet_id=wallet.id, group_by="category")
+    
+    UserService.get_user_by_username(db, user.username)
+    WalletService.get_wallets(db, user)
+    WalletService.get_default_wallet(db, user)
+    WalletService.get_wallet(db, wallet.id, user)
+    WalletService.get_wallet_analytics(db, wallet.id, user, 30)
+    history = WalletService.get_wallet_history(db, wallet.id, user, limit=50)
+    if history["next_cursor"]:
+        WalletService.get_wallet_history(
+            db, wallet.id, user, limit=50, cursor=history["next_cursor"], include_total=False
+        )
+    wallets_api.get_wallet_transfers(skip=0, limit=50, current_user=user, db=db)
+    wallets_api.get_balance_adjustments(wallet.id, skip=0, limit=20, current_user=user, db=db)
+
+def find_seq_scans(plan: dict) -> list:
+    """Return the relations scanned sequentially anywhere in a JSON plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+def check_query_plans(users: int, per_wallet: int) -> bool:
+    """Seed, capture and EXPLAIN the service queries. Returns True if all plans use indexes."""
+    if engine.dialect.name != "postgresql":
+        print("❌ This check requires PostgreSQL")
+        return False
+    
+    connection = engine.connect()
+    outer = connection.begin()
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+    
+    try:
+        print(f"🌱 Seeding {users} users × 3 wallets × {per_wallet} transactions...")
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement), {"users": users, "per_wallet": per_wallet})
+        for table in sorted(CHECKED_TABLES):
+            connection.execute(text(f"ANALYZE {table}"))
+        
+        db = Session(bind=connection, autoflush=False)
+        user = db.query(User).filter(User.username == f"plan_user_{users // 2}").one()
+        wallet = WalletService.get_default_wallet(db, user)
+        
+        event.listen(connection, "before_cursor_execute", capture)
+        try:
+            run_service_queries(db, user, wallet)
+        finally:
+            event.remove(connection, "before_cursor_execute", capture)
+        
+        failures = 0
+        for statement, parameters in captured:
+            result = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = result.scalar()[0]["Plan"]
+            seq_scans = find_seq_scans(plan)
+            summary = " ".join(statement.split())[:100]
+            if seq_scans:
+                failures += 1
+                print(f"❌ Seq Scan on {', '.join(seq_scans)}: {summary}")
+            else:
+                print(f"✅ {summary}")
+        
+        print(f"📋 Checked {len(captured)} queries, {failures} with sequential scans")
+        return failures == 0
+    finally:
+        outer.rollback()
+        connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if service queries plan sequential scans")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--transactions-per-wallet", type=int, default=50)
+    args = parser.parse_args()
+    
+    ok = check_query_plans(args.users, args.transactions_per_wallet)
+    sys.exit(0 if ok else 1)
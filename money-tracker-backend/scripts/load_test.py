@@ -0,0 +1,270 @@
+"""
+Load test harness.
+Runs virtual users against a running API, each logging in and then looping over a
+weighted mix of tasks (dashboard, transaction list, create, transfer, analytics and the
+occasional re-login), and reports p50/p95/p99 latency, throughput and failures per task.
+Save a run with --output and pass it to a later run with --compare to see regressions
+between commits. Needs only the standard library, so it runs offline against a local
+server on PostgreSQL or SQLite.
+
+Log in as accounts created by scripts/seed_data.py (default), or pass --register to
+create fresh accounts first.
+
+Usage: python scripts/load_test.py [--url http://localhost:8000] [--users 20] [--duration 60]
+                                   [--output run.json] [--compare baseline.json]
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+from _stats import percentile
+
+# Task name -> relative weight in the mix
+TASK_WEIGHTS = {
+    "dashboard": 30,
+    "list_transactions": 25,
+    "create_transaction": 15,
+    "analytics": 15,
+    "transfer": 5,
+    "wallets": 8,
+    "login": 2,
+}
+CATEGORIES = ["Food", "Transport", "Shopping", "Entertainment", "Healthcare", "Education", "Other"]
+
+class Client:
+    """Minimal HTTP client for one virtual user."""
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.token = None
+    
+    def request(self, method: str, path: str, body=None, form=None) -> tuple:
+        """Issue a request and return (status, parsed JSON body or None)."""
+        headers = {}
+        data = None
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            data = urllib.parse.urlencode(form).encode()
+        req = urllib.request.Request(self.url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                raw = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            raw = e.read()
+            status = e.code
+        try:
+            return status, json.loads(raw) if raw else None
+        except ValueError:
+            return status, None
+    
+    def login(self, username: str, password: str) -> int:
+        status, body = self.request("POST", "/token", form={"username": username, "password": password})
+        if status == 200:
+            self.token = body["access_token"]
+        return status
+
+class VirtualUser:
+    """One simulated user: logs in, then runs weighted tasks until the deadline."""
+    
+    def __init__(self, url: str, username: str, password: str, rng: random.Random, recorder):
+        self.client = Client(url)
+        self.username = username
+        self.password = password
+        self.rng = rng
+        self.record = recorder
+        self.wallet_ids = []
+    
+    def timed(self, task: str, fn) -> tuple:
+        started = time.perf_counter()
+        try:
+            status, body = fn()
+        except (urllib.error.URLError, OSError):
+            status, body = 0, None
+        self.record(task, (time.perf_counter() - started) * 1000, 200 <= status < 300)
+        return status, body
+    
+    def task_login(self):
+        self.timed("login", lambda: (self.client.login(self.username, self.password), None))
+    
+    def task_wallets(self):
+        status, body = self.timed("wallets", lambda: self.client.request("GET", "/wallets"))
+        if status == 200 and body:
+            self.wallet_ids = [wallet["id"] for wallet in body]
+    
+    def task_dashboard(self):
+        self.timed("dashboard", lambda: self.client.request("GET", "/dashboard"))
+    
+    def task_list_transactions(self):
+        self.timed("list_transactions", lambda: self.client.request("GET", "/transactions?limit=50"))
+    
+    def task_create_transaction(self):
+        self.timed("create_transaction", lambda: self.client.request("POST", "/transactions", body={
+            "amount": round(self.rng.uniform(1, 80), 2),
+            "category": self.rng.choice(CATEGORIES),
+            "description": "load test",
+            "transaction_type": "expense" if self.rng.random() < 0.9 else "income",
+            "date": datetime.utcnow().isoformat(),
+            "wallet_id": self.rng.choice(self.wallet_ids) if self.wallet_ids else None
+        }))
+    
+    def task_transfer(self):
+        if len(self.wallet_ids) < 2:
+            return self.task_wallets()
+        source, target = self.rng.sample(self.wallet_ids, 2)
+        self.timed("transfer", lambda: self.client.request("POST", "/wallets/transfer", body={
+            "from_wallet_id": source, "to_wallet_id": target, "amount": round(self.rng.uniform(1, 20), 2)
+        }))
+    
+    def task_analytics(self):
+        if self.wallet_ids and self.rng.random() < 0.5:
+            wallet_id = self.rng.choice(self.wallet_ids)
+            self.timed("analytics", lambda: self.client.request("GET", f"/wallets/{wallet_id}/analytics"))
+        else:
+            self.timed("analytics", lambda: self.client.request("GET", "/analytics/category-spending"))
+    
+    def run(self, deadline: float, think_seconds: float):
+        self.task_login()
+        self.task_wallets()
+        tasks = list(TASK_WEIGHTS)
+        weights = [TASK_WEIGHTS[task] for task in tasks]
+        while time.monotonic() < deadline:
+            getattr(self, f"task_{self.rng.choices(tasks, weights)[0]}")()
+            if think_seconds:
+                time.sleep(think_seconds)
+
+def register_accounts(url: str, count: int, password: str) -> list:
+    """Create fresh accounts with two wallets each and return their usernames."""
+    usernames = []
+    for _ in range(count):
+        username = f"load_{uuid.uuid4().hex[:10]}"
+        client = Client(url)
+        client.request("POST", "/register", body={
+            "username": username, "email": f"{username}@example.com", "password": password
+        })
+        client.login(username, password)
+        for name, wallet_type in (("Main", "cash"), ("Bank", "bank_account")):
+            client.request("POST", "/wallets", body={"name": name, "wallet_type": wallet_type, "initial_balance": 1000})
+        usernames.append(username)
+    return usernames
+
+def current_commit() -> str:
+    """Short git commit of the working tree, when available."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    """Per-task and total latency percentiles, throughput and failures."""
+    results = {}
+    everything = []
+    total_failures = 0
+    for task in sorted(samples):
+        latencies = [latency for latency, _ in samples[task]]
+        failures = sum(1 for _, ok in samples[task] if not ok)
+        everything.extend(latencies)
+        total_failures += failures
+        results[task] = {
+            "requests": len(latencies), "failures": failures, "rps": len(latencies) / elapsed,
+            "p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "p99": percentile(latencies, 99)
+        }
+    results["total"] = {
+        "requests": len(everything), "failures": total_failures, "rps": len(everything) / elapsed,
+        "p50": percentile(everything, 50), "p95": percentile(everything, 95), "p99": percentile(everything, 99)
+    }
+    return results
+
+def print_results(results: dict, baseline: dict = None):
+    """Print the results table, with relative change against a baseline run if given."""
+    print(f"{'task':<20} {'reqs':>7} {'fail':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for task, row in results.items():
+        print(f"{task:<20} {row['requests']:>7} {row['failures']:>5} {row['rps']:>8.1f} "
+              f"{row['p50']:>7.1f}ms {row['p95']:>7.1f}ms {row['p99']:>7.1f}ms")
+        before = (baseline or {}).get(task)
+        if before:
+            changes = []
+            for key in ("rps", "p50", "p95", "p99"):
+                if before[key]:
+                    changes.append(f"{key} {(row[key] - before[key]) / before[key] * 100:+.0f}%")
+            print(f"{'':<20} vs baseline: {', '.join(changes)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Money Tracker API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+    parser.add_argument("--think", type=float, default=0.0, help="Pause between tasks in seconds")
+    parser.add_argument("--prefix", default="seed", help="Username prefix of seeded accounts")
+    parser.add_argument("--accounts", type=int, default=100, help="Number of seeded accounts to spread users over")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--register", action="store_true", help="Register fresh accounts instead of using seeded ones")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the task mix")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier --output run")
+    args = parser.parse_args()
+    
+    try:
+        if args.register:
+            usernames = register_accounts(args.url, args.users, args.password)
+        else:
+            usernames = [f"{args.prefix}{n % args.accounts}" for n in range(args.users)]
+    except urllib.error.URLError as e:
+        print(f"❌ Could not reach {args.url}: {e}")
+        sys.exit(1)
+    
+    samples = {}
+    lock = threading.Lock()
+    
+    def record(task: str, latency_ms: float, ok: bool):
+        with lock:
+            samples.setdefault(task, []).append((latency_ms, ok))
+    
+    print(f"🚀 {args.users} users for {args.duration:.0f}s against {args.url}")
+    deadline = time.monotonic() + args.duration
+    started = time.monotonic()
+    threads = [
+        threading.Thread(
+            target=VirtualUser(args.url, username, args.password, random.Random(args.seed + n), record).run,
+            args=(deadline, args.think), daemon=True
+        )
+        for n, username in enumerate(usernames)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results = summarize(samples, time.monotonic() - started)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "commit": current_commit(),
+                "started_at": datetime.utcnow().isoformat(),
+                "args": vars(args),
+                "results": results
+            }, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
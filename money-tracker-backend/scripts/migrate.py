@@ -0,0 +1,53 @@
+"""
+Schema migration script.
+Applies the pending migrations in app/migrations to the database in DATABASE_URL, or
+lists which are applied and pending. Safe to run against a live database: indexes are
+built concurrently, DDL waits at most MIGRATION_LOCK_TIMEOUT_MS for its locks, and
+backfills commit in throttled batches. Databases created before migrations existed are
+brought up to date the same way; steps that are already done are skipped.
+
+Usage: python scripts/migrate.py [upgrade|status] [--target VERSION] [--batch-size N] [--sleep-ms MS]
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.core.migrations import applied_versions, load_migrations, upgrade
+
+def status(engine):
+    """Print every migration with the time it was applied, or pending."""
+    applied = applied_versions(engine)
+    for migration in load_migrations():
+        state = f"applied {applied[migration.version]:%Y-%m-%d %H:%M}" if migration.version in applied else "pending"
+        print(f"{migration.version}  {state:<22} {migration.description}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or list schema migrations")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status"], default="upgrade")
+    parser.add_argument("--target", help="Stop after this version (default: latest)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per backfill batch")
+    parser.add_argument("--sleep-ms", type=float, default=None, help="Pause between backfill batches")
+    args = parser.parse_args()
+    
+    # A plain engine: no statement timeout, which long concurrent index builds would hit
+    engine = create_engine(settings.DATABASE_URL)
+    if args.command == "status":
+        status(engine)
+        return
+    
+    try:
+        applied = upgrade(
+            engine, args.target, args.batch_size,
+            args.sleep_ms / 1000 if args.sleep_ms is not None else None
+        )
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        raise
+    print(f"🎉 Applied {len(applied)} migration(s)" if applied else "✅ Database is up to date")
+
+if __name__ == "__main__":
+    main()
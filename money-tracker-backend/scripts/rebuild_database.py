@@ -1,6 +1,7 @@
 """
 Database rebuild script for wallet management schema updates.
-This script will drop all existing tables and recreate them with the new schema.
+This script will drop all existing tables and recreate them with the new schema, then
+record every migration as applied. Works on PostgreSQL and SQLite.
 
 WARNING: This will delete all existing data. Use only in development.
 """
@@ -9,8 +10,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import text
+from sqlalchemy import inspect
 from app.core.database import engine, Base
+from app.core.migrations import schema_migrations, upgrade
 
 def rebuild_database():
     """Drop all tables and recreate with new schema."""
@@ -24,6 +26,7 @@ def rebuild_database():
     try:
         # Drop all tables
         Base.metadata.drop_all(bind=engine)
+        schema_migrations.drop(bind=engine, checkfirst=True)
         print("✅ All tables dropped successfully")
         
         # Recreate all tables with new schema
@@ -31,12 +34,13 @@ def rebuild_database():
         Base.metadata.create_all(bind=engine)
         print("✅ All tables created successfully with new schema")
         
+        # The tables already match the latest migration, so this only records them
+        upgrade(engine, log=lambda message: None)
+        
         # Verify tables were created
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'"))
-            tables = [row[0] for row in result]
-            print(f"📋 Created tables: {', '.join(tables)}")
-            
+        tables = inspect(engine).get_table_names()
+        print(f"📋 Created tables: {', '.join(tables)}")
+    
     except Exception as e:
         print(f"❌ Error rebuilding database: {e}")
         raise
@@ -0,0 +1,50 @@
+"""
+Rollup rebuild script for the monthly transaction totals.
+Recomputes the transaction_rollups table from the raw transactions, for when the totals
+need repairing. The table is created and backfilled by scripts/migrate.py, which has to
+have run first.
+
+Usage: python scripts/rebuild_rollups.py [--user-id ID]
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import sessionmaker
+from app.core.database import engine
+from app.services.rollup_service import RollupService
+
+def rebuild_rollups(user_id=None):
+    """Rebuild rollups for one user, or for all users when user_id is None."""
+    # Import all models to ensure they're registered with Base
+    import app.models  # noqa: F401
+    
+    # The schema belongs to the migrations; don't create tables behind their back
+    if not inspect(engine).has_table("transaction_rollups"):
+        print("❌ The transaction_rollups table does not exist, run scripts/migrate.py first")
+        sys.exit(1)
+    
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    
+    try:
+        row_count = RollupService.rebuild(db, user_id)
+        db.commit()
+        target = f"user {user_id}" if user_id is not None else "all users"
+        print(f"✅ Rebuilt {row_count} rollup rows for {target}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding rollups: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild monthly transaction rollups")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild rollups for this user")
+    args = parser.parse_args()
+    
+    rebuild_rollups(args.user_id)
@@ -0,0 +1,216 @@
+"""
+Bulk seed script for benchmarks and load tests.
+Generates N users x M wallets x K transactions per wallet, plus transfers and balance
+adjustments, with a year of realistic activity: monthly salaries, weekday/weekend
+spending patterns and per-category amount distributions. Wallet balances are computed
+to agree with the generated history, and the monthly rollups are rebuilt at the end.
+
+Rows are written with COPY on PostgreSQL and with batched multi-row INSERTs elsewhere.
+Every seeded user gets the same password so the load test can log in as them.
+
+Usage: python scripts/seed_data.py [--users 100] [--wallets 3] [--transactions 500]
+                                   [--transfers 20] [--adjustments 2] [--prefix seed]
+"""
+
+import sys
+import os
+import csv
+import io
+import math
+import random
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.core.database import engine, Base
+from app.core.money import to_money
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.models.wallet import Wallet, WalletTransfer, BalanceAdjustment
+from app.models.transaction import Transaction
+from app.services.rollup_service import RollupService
+
+# (category, share of expenses, median amount)
+EXPENSE_CATEGORIES = [
+    ("Food", 0.35, 15), ("Transport", 0.20, 8), ("Shopping", 0.15, 45),
+    ("Entertainment", 0.12, 25), ("Healthcare", 0.06, 60), ("Education", 0.04, 80),
+    ("Other", 0.08, 20),
+]
+WALLET_TYPES = ["cash", "bank_account", "credit_card", "savings", "investment"]
+INSERT_BATCH_SIZE = 5000
+
+def random_amount(rng: random.Random, median: float) -> Decimal:
+    """Log-normally distributed amount around median, in whole cents."""
+    return to_money(max(0.5, rng.lognormvariate(math.log(median), 0.6)))
+
+def random_moment(rng: random.Random, start: datetime, days: int) -> datetime:
+    """Random time within the period, with more spending on weekends and in the daytime."""
+    while True:
+        day = start + timedelta(days=rng.randrange(days))
+        if day.weekday() >= 5 or rng.random() < 0.75:
+            break
+    return day + timedelta(hours=rng.triangular(7, 23, 18), minutes=rng.randrange(60))
+
+def write_rows(db, model, columns: list, rows: list):
+    """Write rows (tuples in columns order) with COPY on PostgreSQL, else batched INSERTs."""
+    if not rows:
+        return
+    if engine.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(rows)
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        cursor.copy_expert(
+            f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+        return
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(model), [dict(zip(columns, row)) for row in rows[start:start + INSERT_BATCH_SIZE]])
+
+def seed_user(db, rng: random.Random, index: int, args, hashed_password: str, start: datetime) -> dict:
+    """Create one user with wallets and history; return row counts."""
+    user = User(username=f"{args.prefix}{index}", email=f"{args.prefix}{index}@example.com",
+                hashed_password=hashed_password, created_at=start)
+    db.add(user)
+    db.flush()
+    
+    wallets = [
+        Wallet(
+            name=f"Wallet {n + 1}", wallet_type=WALLET_TYPES[n % len(WALLET_TYPES)],
+            balance=to_money(rng.uniform(100, 5000)), is_default=n == 0, is_active=True,
+            created_at=start, updated_at=start, user_id=user.id
+        )
+        for n in range(args.wallets)
+    ]
+    db.add_all(wallets)
+    db.flush()
+    balances = {wallet.id: wallet.balance for wallet in wallets}
+    now = datetime.utcnow()
+    
+    transactions = []
+    salary = random_amount(rng, 3000)
+    for wallet in wallets:
+        count = args.transactions
+        if wallet.is_default:
+            # Salary lands in the default wallet at the start of every month
+            month = start.replace(day=1, hour=9)
+            while month < now and count > 0:
+                if month >= start:
+                    transactions.append((salary, "Salary", "Monthly salary", "income", month, month, user.id, wallet.id))
+                    balances[wallet.id] += salary
+                    count -= 1
+                month = (month + timedelta(days=32)).replace(day=1)
+        for _ in range(count):
+            moment = random_moment(rng, start, args.days)
+            if rng.random() < 0.08:
+                amount = random_amount(rng, 150)
+                transactions.append((amount, "Other", "Side income", "income", moment, moment, user.id, wallet.id))
+                balances[wallet.id] += amount
+            else:
+                category, _, median = rng.choices(EXPENSE_CATEGORIES, weights=[c[1] for c in EXPENSE_CATEGORIES])[0]
+                amount = random_amount(rng, median)
+                transactions.append((amount, category, f"{category} purchase", "expense", moment, moment, user.id, wallet.id))
+                balances[wallet.id] -= amount
+    
+    transfers = []
+    if len(wallets) > 1:
+        for _ in range(args.transfers):
+            source, target = rng.sample(wallets, 2)
+            amount = random_amount(rng, 200)
+            moment = random_moment(rng, start, args.days)
+            transfers.append((amount, "Seeded transfer", moment, moment, source.id, target.id, user.id))
+            balances[source.id] -= amount
+            balances[target.id] += amount
+    
+    # Wallets that mostly spend would end up in the red; top them up when they are opened,
+    # with an adjustment so their balance still adds up from the recorded history
+    adjustments = []
+    for wallet in wallets:
+        if balances[wallet.id] < 0:
+            top_up = to_money(rng.uniform(100, 1000)) - balances[wallet.id]
+            adjustments.append((wallet.id, wallet.balance, wallet.balance + top_up, top_up,
+                                "Opening balance top-up", start, user.id))
+            balances[wallet.id] += top_up
+    
+    for n in range(args.adjustments):
+        wallet = wallets[n % len(wallets)]
+        old_balance = balances[wallet.id]
+        new_balance = old_balance + to_money(rng.uniform(-20, 20))
+        adjustments.append((wallet.id, old_balance, new_balance, new_balance - old_balance,
+                            "Reconciliation", now - timedelta(days=n), user.id))
+        balances[wallet.id] = new_balance
+    
+    write_rows(db, Transaction, ["amount", "category", "description", "transaction_type", "date",
+                                 "created_at", "user_id", "wallet_id"], transactions)
+    write_rows(db, WalletTransfer, ["amount", "description", "transfer_date", "created_at",
+                                    "from_wallet_id", "to_wallet_id", "user_id"], transfers)
+    write_rows(db, BalanceAdjustment, ["wallet_id", "old_balance", "new_balance", "adjustment_amount",
+                                       "reason", "adjusted_at", "user_id"], adjustments)
+    for wallet in wallets:
+        wallet.balance = balances[wallet.id]
+    
+    return {"transactions": len(transactions), "transfers": len(transfers), "adjustments": len(adjustments)}
+
+def seed_data(args):
+    """Seed args.users users and rebuild the rollups."""
+    # Import all models to ensure they're registered with Base
+    import app.models  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    rng = random.Random(args.seed)
+    hashed_password = get_password_hash(args.password)
+    start = (datetime.utcnow() - timedelta(days=args.days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    totals = {"transactions": 0, "transfers": 0, "adjustments": 0}
+    started = time.perf_counter()
+    
+    try:
+        if db.query(User).filter(User.username == f"{args.prefix}0").first():
+            print(f"❌ Users with prefix '{args.prefix}' already exist; pass another --prefix")
+            sys.exit(1)
+        for index in range(args.users):
+            counts = seed_user(db, rng, index, args, hashed_password, start)
+            for key, value in counts.items():
+                totals[key] += value
+            if (index + 1) % args.commit_every == 0:
+                db.commit()
+                print(f"🔄 {index + 1}/{args.users} users, {totals['transactions']} transactions")
+        RollupService.rebuild(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error seeding data: {e}")
+        raise
+    finally:
+        db.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ Seeded {args.users} users, {args.users * args.wallets} wallets, {totals['transactions']} transactions, "
+          f"{totals['transfers']} transfers and {totals['adjustments']} adjustments in {elapsed:.1f}s")
+    print(f"🔑 Log in as {args.prefix}0..{args.prefix}{args.users - 1} with password '{args.password}'")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-generate users, wallets and transaction history")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--wallets", type=int, default=3, help="Wallets per user")
+    parser.add_argument("--transactions", type=int, default=500, help="Transactions per wallet")
+    parser.add_argument("--transfers", type=int, default=20, help="Transfers per user")
+    parser.add_argument("--adjustments", type=int, default=2, help="Balance adjustments per user")
+    parser.add_argument("--days", type=int, default=365, help="Length of the generated history")
+    parser.add_argument("--prefix", default="seed", help="Username prefix")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--commit-every", type=int, default=20, help="Users per database transaction")
+    args = parser.parse_args()
+    if args.wallets < 1:
+        parser.error("--wallets must be at least 1")
+    seed_data(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Wallet balance concurrency stress test.
+Hammers two wallets of a throwaway user from many threads with transaction creates,
+updates, deletes and transfers in both directions, then checks that each stored balance
+equals its opening balance plus the surviving transactions and transfers. Any lost
+update shows up as a mismatch. The throwaway user and its rows are removed afterwards.
+
+Usage: python scripts/stress_wallet_balance.py [--threads 20] [--operations 50]
+"""
+
+import sys
+import os
+import uuid
+import random
+import argparse
+import threading
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import func, case
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import SessionLocal, engine, Base
+from app.models.user import User
+from app.models.wallet import Wallet, WalletTransfer, BalanceAdjustment
+from app.models.transaction import Transaction, TransactionRollup
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.schemas.wallet import WalletCreate, WalletTransferCreate
+from app.services.transaction_service import TransactionService
+from app.services.wallet_service import WalletService
+
+OPENING_BALANCE = 1000
+
+def create_fixture() -> tuple:
+    """Create a throwaway user with two wallets and return (user_id, wallet_ids)."""
+    db = SessionLocal()
+    try:
+        user = User(username=f"stress_{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@example.com",
+                    hashed_password="-")
+        db.add(user)
+        db.commit()
+        wallet_ids = [
+            WalletService.create_wallet(db, WalletCreate(name=name, wallet_type="cash", initial_balance=OPENING_BALANCE), user).id
+            for name in ("Stress A", "Stress B")
+        ]
+        return user.id, wallet_ids
+    finally:
+        db.close()
+
+def worker(user_id: int, wallet_ids: list, operations: int, seed: int, errors: list):
+    """Run a random mix of balance-changing operations in one session."""
+    rng = random.Random(seed)
+    db = SessionLocal()
+    created = []
+    try:
+        user = db.get(User, user_id)
+        for _ in range(operations):
+            action = rng.random()
+            try:
+                if action < 0.5 or not created:
+                    transaction = TransactionService.create_transaction(db, TransactionCreate(
+                        amount=rng.randint(1, 20), category="Stress", description="stress",
+                        transaction_type=rng.choice(["income", "expense"]),
+                        date=datetime.utcnow(), wallet_id=rng.choice(wallet_ids)
+                    ), user)
+                    created.append(transaction.id)
+                elif action < 0.65:
+                    TransactionService.update_transaction(db, rng.choice(created), TransactionUpdate(
+                        amount=rng.randint(1, 20), wallet_id=rng.choice(wallet_ids)
+                    ), user)
+                elif action < 0.8:
+                    TransactionService.delete_transaction(db, created.pop(rng.randrange(len(created))), user)
+                else:
+                    source, target = rng.sample(wallet_ids, 2)
+                    WalletService.transfer_money(db, WalletTransferCreate(
+                        from_wallet_id=source, to_wallet_id=target, amount=rng.randint(1, 50)
+                    ), user)
+            except HTTPException:
+                # Insufficient balance is an expected outcome of a transfer
+                db.rollback()
+            except OperationalError as e:
+                # SQLite gives up on a busy database; count it but keep going
+                db.rollback()
+                errors.append(str(e.orig))
+    finally:
+        db.close()
+
+def expected_balance(db, wallet_id: int) -> float:
+    """Opening balance plus surviving transactions and transfers for a wallet."""
+    signed = db.query(func.coalesce(func.sum(
+        case((Transaction.transaction_type == "income", Transaction.amount), else_=-Transaction.amount)
+    ), 0)).filter(Transaction.wallet_id == wallet_id).scalar()
+    incoming = db.query(func.coalesce(func.sum(WalletTransfer.amount), 0)).filter(
+        WalletTransfer.to_wallet_id == wallet_id
+    ).scalar()
+    outgoing = db.query(func.coalesce(func.sum(WalletTransfer.amount), 0)).filter(
+        WalletTransfer.from_wallet_id == wallet_id
+    ).scalar()
+    return OPENING_BALANCE + signed + incoming - outgoing
+
+def cleanup(user_id: int):
+    """Delete the throwaway user and everything it owns."""
+    db = SessionLocal()
+    try:
+        for model in (Transaction, TransactionRollup, WalletTransfer, BalanceAdjustment, Wallet):
+            db.query(model).filter(model.user_id == user_id).delete(synchronize_session=False)
+        db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Check wallet balances stay exact under concurrent writes")
+    parser.add_argument("--threads", type=int, default=20)
+    parser.add_argument("--operations", type=int, default=50, help="Operations per thread")
+    args = parser.parse_args()
+    
+    import app.models  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    
+    user_id, wallet_ids = create_fixture()
+    errors = []
+    print(f"🚀 {args.threads} threads x {args.operations} operations on wallets {wallet_ids}")
+    threads = [
+        threading.Thread(target=worker, args=(user_id, wallet_ids, args.operations, seed, errors))
+        for seed in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    db = SessionLocal()
+    failed = False
+    try:
+        for wallet_id in wallet_ids:
+            actual = db.get(Wallet, wallet_id).balance
+            expected = expected_balance(db, wallet_id)
+            status = "✅" if abs(actual - expected) < 1e-6 else "❌"
+            failed = failed or status == "❌"
+            print(f"{status} wallet {wallet_id}: balance={actual} expected={expected}")
+    finally:
+        db.close()
+        cleanup(user_id)
+    
+    if errors:
+        print(f"⚠️  {len(errors)} operations failed with database errors (e.g. {errors[0]})")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
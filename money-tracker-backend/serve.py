@@ -0,0 +1,72 @@
+"""
+Production server entry point for the Money Tracker API.
+
+Runs WEB_WORKERS uvicorn worker processes on one listening socket, with the keep-alive,
+backlog and graceful shutdown timeouts from Settings. Before the workers start, state
+that must agree across processes is moved out of them:
+
+- Prometheus snapshots go to METRICS_MULTIPROC_DIR (emptied here), so /metrics on any
+  worker reports every worker.
+- The user cache and the per-user data versions switch from "memory" to the "sqlite"
+  backend, a file shared by the workers, so a write or user change seen by one worker
+  invalidates the others. Redis (set the backends to "redis") works across hosts too.
+- Unless PASSWORD_HASH_WORKERS is set, the CPUs are divided between the workers' bcrypt
+  pools instead of each worker claiming up to four.
+
+Usage: python serve.py
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+
+from app.core.config import settings
+
+logger = logging.getLogger("money_tracker.server")
+
+def prepare_shared_state(workers: int):
+    """Point cross-process state at the runtime directory via the workers' environment."""
+    if workers <= 1:
+        return
+    runtime_dir = settings.WEB_RUNTIME_DIR or tempfile.mkdtemp(prefix="money-tracker-")
+    os.makedirs(runtime_dir, exist_ok=True)
+    
+    # Snapshots from a previous run would be summed into this one
+    metrics_dir = settings.METRICS_MULTIPROC_DIR or os.path.join(runtime_dir, "metrics")
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+    
+    shared_cache = settings.SHARED_CACHE_PATH or os.path.join(runtime_dir, "shared-cache.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(shared_cache + suffix):
+            os.remove(shared_cache + suffix)
+    os.environ["SHARED_CACHE_PATH"] = shared_cache
+    for name in ("USER_CACHE_BACKEND", "DATA_VERSION_BACKEND"):
+        if getattr(settings, name) == "memory":
+            os.environ[name] = "sqlite"
+            logger.info("%s=memory is per process; using the shared sqlite backend", name)
+    
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+def main():
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    workers = max(1, settings.WEB_WORKERS)
+    prepare_shared_state(workers)
+    
+    import uvicorn
+    # Workers are spawned processes that import the app themselves, so it is passed by name
+    uvicorn.run(
+        "main:app",
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        workers=workers,
+        backlog=settings.WEB_BACKLOG,
+        timeout_keep_alive=settings.WEB_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT_SECONDS,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+if __name__ == "__main__":
+    main()
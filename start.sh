@@ -51,6 +51,10 @@ if [ requirements.txt -nt venv/pyvenv.cfg ] || [ ! -f venv/.deps_installed ]; th
     touch venv/.deps_installed
 fi
 
+# Create or upgrade the database schema
+echo "🗄️  Applying database migrations..."
+python scripts/migrate.py || exit 1
+
 # Start backend in background
 echo "🚀 Starting FastAPI server..."
 uvicorn main:app --reload &